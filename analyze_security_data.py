@@ -5,52 +5,63 @@ Analyze existing security data to see what's already collected
 
 import json
 import sys
+from itertools import islice
+
+# Streaming JSON parsing (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+def iter_security_objects(f):
+    """Yield (object_name, object_data) pairs from security.json one object at a time."""
+    if IJSON_AVAILABLE:
+        return ijson.kvitems(f, '')
+    return iter(json.load(f).items())
 
 def analyze_security_data():
     """Analyze the security.json file to see what data is available."""
     
     try:
-        with open('output/security.json', 'r') as f:
-            data = json.load(f)
-        
-        print(f"Total objects with security data: {len(data)}")
-        
+        total_objects = 0
         profiles = set()
         permission_sets = set()
         objects_with_permissions = 0
+        objects_with_field_permissions = 0
         
-        for obj_name, obj_data in data.items():
-            if 'object_permissions' in obj_data:
-                objects_with_permissions += 1
-                for perm_type, perm_data in obj_data['object_permissions'].items():
-                    if perm_type == 'profiles':
-                        profiles.update(perm_data.keys())
-                    elif perm_type == 'permission_sets':
-                        permission_sets.update(perm_data.keys())
+        # Only one object's data is held in memory at a time
+        with open('output/security.json', 'rb') as f:
+            for obj_name, obj_data in iter_security_objects(f):
+                total_objects += 1
+                if 'object_permissions' in obj_data:
+                    objects_with_permissions += 1
+                    for perm_type, perm_data in obj_data['object_permissions'].items():
+                        if perm_type == 'profiles':
+                            profiles.update(perm_data.keys())
+                        elif perm_type == 'permission_sets':
+                            permission_sets.update(perm_data.keys())
+                if 'field_permissions' in obj_data and obj_data['field_permissions']:
+                    objects_with_field_permissions += 1
         
+        print(f"Total objects with security data: {total_objects}")
         print(f"Objects with permissions data: {objects_with_permissions}")
         print(f"Profiles found: {len(profiles)}")
         print(f"Permission sets found: {len(permission_sets)}")
         
         if profiles:
-            print(f"Sample profiles: {list(profiles)[:5]}")
+            print(f"Sample profiles: {list(islice(profiles, 5))}")
         
         if permission_sets:
-            print(f"Sample permission sets: {list(permission_sets)[:5]}")
-        
-        # Check for field permissions
-        objects_with_field_permissions = 0
-        for obj_name, obj_data in data.items():
-            if 'field_permissions' in obj_data and obj_data['field_permissions']:
-                objects_with_field_permissions += 1
+            print(f"Sample permission sets: {list(islice(permission_sets, 5))}")
         
         print(f"Objects with field permissions: {objects_with_field_permissions}")
         
         # Check corpus.jsonl
         try:
-            with open('output/corpus.jsonl', 'r') as f:
-                corpus_lines = f.readlines()
-            print(f"Corpus entries: {len(corpus_lines)}")
+            with open('output/corpus.jsonl', 'rb') as f:
+                corpus_entries = sum(1 for _ in f)
+            print(f"Corpus entries: {corpus_entries}")
         except FileNotFoundError:
             print("Corpus file not found")
         
@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 import json
+import mmap
+import os
 
-with open('output/corpus.jsonl', 'r') as f:
-    for line in f:
-        if line.strip():
-            doc = json.loads(line)
+CORPUS_PATH = 'output/corpus.jsonl'
+MARKER = b'security_Account'
+
+# Search the raw bytes for the marker and only decode the lines that contain it
+if os.path.getsize(CORPUS_PATH):
+    with open(CORPUS_PATH, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(MARKER)
+        while pos != -1:
+            start = mm.rfind(b'\n', 0, pos) + 1
+            end = mm.find(b'\n', pos)
+            if end == -1:
+                end = len(mm)
+            doc = json.loads(mm[start:end])
             if 'security_Account' in doc.get('id', ''):
                 print("ACCOUNT SECURITY DOCUMENT FOUND!")
                 print("=" * 50)
@@ -15,3 +26,4 @@ with open('output/corpus.jsonl', 'r') as f:
                 print(doc.get('text', ''))
                 print("=" * 50)
                 break
+            pos = mm.find(MARKER, end)
@@ -18,7 +18,7 @@ if 'Account' in security_data:
         elif isinstance(value, dict):
             print(f"\n{key}: {len(value)} items")
             if value:
-                sample_key = list(value.keys())[0]
+                sample_key = next(iter(value))
                 print(f"  Sample key: {sample_key}")
                 print(f"  Sample value: {value[sample_key]}")
         else:
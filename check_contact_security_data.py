@@ -48,7 +48,7 @@ def check_contact_security_data():
             object_permissions = contact_data.get('object_permissions', {})
             print(f"\nobject_permissions: {len(object_permissions)} items")
             if object_permissions:
-                sample_key = list(object_permissions.keys())[0]
+                sample_key = next(iter(object_permissions))
                 sample_value = object_permissions[sample_key]
                 print(f"  Sample key: {sample_key}")
                 print(f"  Sample value: {sample_value}")
@@ -1,29 +1,40 @@
 #!/usr/bin/env python3
 import json
+import sys
 
 count = 0
 account_found = False
 account_security_found = False
 
-with open('output/corpus.jsonl', 'r') as f:
+# One line is printed per document, so collect the output and write it in one go
+out = []
+
+# Lines stay as bytes; json.loads decodes them itself
+with open('output/corpus.jsonl', 'rb') as f:
     for line in f:
-        if line.strip():
+        line = line.strip()
+        if line:
             count += 1
+            # Every record is a JSON object; reject anything else without raising
+            if line[0] != ord('{'):
+                out.append(f'Line {count}: ERROR parsing JSON')
+                continue
             try:
                 doc = json.loads(line)
                 doc_id = doc.get('id', 'unknown')
-                print(f'Line {count}: {doc_id}')
+                out.append(f'Line {count}: {doc_id}')
                 
                 if 'Account' in doc_id:
                     if 'security_Account' in doc_id:
                         account_security_found = True
-                        print(f'  *** FOUND ACCOUNT SECURITY DOCUMENT ***')
-                        print(f'  Content preview: {doc.get("text", "")[:200]}...')
+                        out.append(f'  *** FOUND ACCOUNT SECURITY DOCUMENT ***')
+                        out.append(f'  Content preview: {doc.get("text", "")[:200]}...')
                     else:
                         account_found = True
-            except:
-                print(f'Line {count}: ERROR parsing JSON')
+            except (ValueError, KeyError, AttributeError, TypeError):
+                out.append(f'Line {count}: ERROR parsing JSON')
 
-print(f'\nTotal lines: {count}')
-print(f'Account object found: {account_found}')
-print(f'Account security found: {account_security_found}')
+out.append(f'\nTotal lines: {count}')
+out.append(f'Account object found: {account_found}')
+out.append(f'Account security found: {account_security_found}')
+sys.stdout.write('\n'.join(out) + '\n')
@@ -5,6 +5,7 @@ Simple script to check what's actually in the Pinecone index
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pinecone import Pinecone
 from openai import OpenAI
@@ -107,9 +108,15 @@ def check_pinecone_index():
         "Account field permissions"
     ]
     
-    for query in account_queries:
+    # The searches are independent network round trips, so run them together
+    # and report the results in query order
+    with ThreadPoolExecutor(max_workers=len(account_queries)) as executor:
+        all_account_results = list(executor.map(
+            lambda query: vector_store.similarity_search(query, k=5), account_queries
+        ))
+    
+    for query, account_results in zip(account_queries, all_account_results):
         print(f"\n--- Testing query: '{query}' ---")
-        account_results = vector_store.similarity_search(query, k=5)
         print(f"Found {len(account_results)} results")
         
         account_found = False
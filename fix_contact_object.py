@@ -12,22 +12,21 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Resolved once at import; run_sf_command changes directory before using them
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(SCRIPT_DIR)  # Parent of salesforce-rag-bot
+BATCH_FILE = os.path.join(SCRIPT_DIR, "run_sf_command.bat")
+
 def run_sf_command(args, org_alias="NEWORG"):
     """Run Salesforce CLI command"""
     try:
-        # Get the script's directory and navigate to parent
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        parent_dir = os.path.dirname(script_dir)  # Go to parent of salesforce-rag-bot
-        
-        print(f"🔍 Changing to directory: {parent_dir}")
+        # Navigate to the parent of the script's directory
+        print(f"🔍 Changing to directory: {PARENT_DIR}")
         original_dir = os.getcwd()
-        os.chdir(parent_dir)
+        os.chdir(PARENT_DIR)
         
         # Use a batch file approach to run the command
-        batch_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_sf_command.bat")
-        
-        # Build the command string for the batch file
-        cmd_string = f'"{batch_file}"'
+        cmd_string = f'"{BATCH_FILE}"'
         print(f"🔍 Running command: {cmd_string}")
         
         # Run the batch file
@@ -63,7 +63,7 @@ class PerformanceMonitor:
             for j in range(num_iterations):
                 print(f"  Iteration {j+1}/{num_iterations}...")
                 
-                start_time = time.time()
+                start_time = time.perf_counter()
                 
                 try:
                     # Perform the search
@@ -72,7 +72,7 @@ class PerformanceMonitor:
                     # Get cache stats
                     cache_stats = self.rag_service.get_cache_stats()
                     
-                    end_time = time.time()
+                    end_time = time.perf_counter()
                     duration = end_time - start_time
                     
                     iteration_result = {
@@ -5,23 +5,18 @@ Enhanced RAG Service with Hierarchical Vector DB Organization
 
 import os
 import sys
-import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import re
+from typing import List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
-import hashlib
 import time
-from functools import lru_cache
 
 # LangChain imports
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_pinecone import PineconeVectorStore
 from langchain.schema import Document
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema.runnable import RunnablePassthrough
 from langchain.schema.output_parser import StrOutputParser
 
 # Pinecone imports
@@ -65,6 +60,32 @@ class SearchContext:
     search_strategy: SearchStrategy
     max_results: int = 10
 
+# Query keywords that select a document type; matched as substrings
+QUERY_TYPE_KEYWORDS = {
+    'field': DocumentType.FIELD_METADATA,
+    'fields': DocumentType.FIELD_METADATA,
+    'column': DocumentType.FIELD_METADATA,
+    'attribute': DocumentType.FIELD_METADATA,
+    'security': DocumentType.SECURITY_PERMISSIONS,
+    'permission': DocumentType.SECURITY_PERMISSIONS,
+    'access': DocumentType.SECURITY_PERMISSIONS,
+    'crud': DocumentType.SECURITY_PERMISSIONS,
+    'automation': DocumentType.AUTOMATION,
+    'flow': DocumentType.AUTOMATION,
+    'workflow': DocumentType.AUTOMATION,
+    'trigger': DocumentType.AUTOMATION,
+    'relationship': DocumentType.RELATIONSHIP,
+    'lookup': DocumentType.RELATIONSHIP,
+    'master-detail': DocumentType.RELATIONSHIP,
+}
+OBJECT_FIELDS_KEYWORDS = ('object', 'in my', 'are in')
+
+# One pass over the query finds every keyword; the lookahead keeps
+# overlapping matches such as 'flow' inside 'workflow'
+_QUERY_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(k) for k in (*QUERY_TYPE_KEYWORDS, *OBJECT_FIELDS_KEYWORDS)) + '))'
+)
+
 class EnhancedRAGService:
     """
     Enhanced RAG Service with hierarchical search and better organization
@@ -119,6 +140,8 @@ class EnhancedRAGService:
             )
             logger.info(f"Using OpenAI model: {config.OPENAI_MODEL}")
         elif config.ANTHROPIC_API_KEY:
+            # Provider SDKs are only imported when selected
+            from langchain_anthropic import ChatAnthropic
             self.llm = ChatAnthropic(
                 model=config.ANTHROPIC_MODEL,
                 temperature=config.TEMPERATURE,
@@ -127,6 +150,7 @@ class EnhancedRAGService:
             )
             logger.info(f"Using Anthropic model: {config.ANTHROPIC_MODEL}")
         elif config.GOOGLE_API_KEY:
+            from langchain_google_genai import ChatGoogleGenerativeAI
             self.llm = ChatGoogleGenerativeAI(
                 model=config.GOOGLE_MODEL,
                 temperature=config.TEMPERATURE,
@@ -196,15 +220,17 @@ class EnhancedRAGService:
                     target_fields.append(field_name)
         
         # Determine document types
-        document_types = []
-        if any(keyword in query_lower for keyword in ['field', 'fields', 'column', 'attribute']):
-            document_types.append(DocumentType.FIELD_METADATA)
-        if any(keyword in query_lower for keyword in ['security', 'permission', 'access', 'crud']):
-            document_types.append(DocumentType.SECURITY_PERMISSIONS)
-        if any(keyword in query_lower for keyword in ['automation', 'flow', 'workflow', 'trigger']):
-            document_types.append(DocumentType.AUTOMATION)
-        if any(keyword in query_lower for keyword in ['relationship', 'lookup', 'master-detail']):
-            document_types.append(DocumentType.RELATIONSHIP)
+        found_keywords = {m.group(1) for m in _QUERY_KEYWORD_RE.finditer(query_lower)}
+        found_types = {QUERY_TYPE_KEYWORDS[k] for k in found_keywords if k in QUERY_TYPE_KEYWORDS}
+        document_types = [
+            doc_type for doc_type in (
+                DocumentType.FIELD_METADATA,
+                DocumentType.SECURITY_PERMISSIONS,
+                DocumentType.AUTOMATION,
+                DocumentType.RELATIONSHIP,
+            )
+            if doc_type in found_types
+        ]
         
         # If no specific types detected, default to object search
         if not document_types:
@@ -212,8 +238,8 @@ class EnhancedRAGService:
         
         # Special case: If asking about object fields, prioritize object search
         if (target_objects and 
-            any(keyword in query_lower for keyword in ['field', 'fields']) and
-            any(keyword in query_lower for keyword in ['object', 'in my', 'are in'])):
+            found_keywords & {'field', 'fields'} and
+            found_keywords.intersection(OBJECT_FIELDS_KEYWORDS)):
             document_types = [DocumentType.SALESFORCE_OBJECT]
         
         # Determine search strategy
@@ -427,7 +453,7 @@ class EnhancedRAGService:
     
     def search_context(self, query: str, top_k: int = 10) -> List[Document]:
         """Main search method with enhanced strategy"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Analyze the query
@@ -465,7 +491,7 @@ class EnhancedRAGService:
                             except Exception as e:
                                 logger.warning(f"Fallback lookup failed for {target_obj}: {e}")
             
-            logger.info(f"🔍 Search completed in {time.time() - start_time:.2f}s, found {len(results)} results")
+            logger.info(f"🔍 Search completed in {time.perf_counter() - start_time:.2f}s, found {len(results)} results")
             return results
             
         except Exception as e:
@@ -1,19 +1,16 @@
 import os
 from typing import List, Dict, Any, Optional
 import logging
+import re
 from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_pinecone import PineconeVectorStore
 from langchain.schema import Document
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema.runnable import RunnablePassthrough
 from langchain.schema.output_parser import StrOutputParser
 import pinecone
 import sys
 import hashlib
 import time
-from functools import lru_cache
 
 # Add the current directory to the path so we can import config
 sys.path.append(os.path.dirname(__file__))
@@ -23,6 +20,49 @@ from config import config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Profile name mapping - map common aliases to actual profile names
+# Order matters: longer, more specific patterns first
+PROFILE_MAPPINGS = [
+    ('admin profile', 'system administrator'),
+    ('sys admin', 'system administrator'),
+    ('system admin', 'system administrator'),
+    ('administrator', 'system administrator'),
+    ('admin', 'system administrator'),
+    ('standard user', 'standard user'),
+    ('read only', 'read only'),
+    ('marketing user', 'marketing user'),
+    ('sales user', 'custom: sales profile'),
+    ('support user', 'custom: support profile'),
+    ('contract manager', 'contract manager'),
+    ('solution manager', 'solution manager')
+]
+_PROFILE_ALIAS_RES = {alias: re.compile(re.escape(alias), re.IGNORECASE) for alias, _ in PROFILE_MAPPINGS}
+
+# Direct lookup patterns, compiled once and matched against the lower-cased query
+_FIELDS_IN_OBJECT_RE = re.compile(r'fields?\s+in\s+(?:my\s+)?(\w+)\s+object')
+_ADMIN_PERMISSION_RE = re.compile(r'(?:admin|system\s+administrator).*?(?:edit|permission).*?(?:on\s+)?(\w+)')
+_DIRECT_OBJECT_RE = re.compile(r'\b(account|contact|lead|opportunity|case|user|profile)\b')
+
+# Look for object names in quotes, after "for the", or standalone
+_OBJECT_NAME_RES = [re.compile(pattern) for pattern in (
+    r'"([^"]+)"',  # Objects in quotes
+    r'for the (\w+) object',  # "for the Account object"
+    r'the (\w+) object',  # "the Contact object"
+    r'(\w+) object',  # "Account object"
+    r'(\w+) records?',  # "Lead records"
+    r'(\w+) data',  # "Account data"
+    r'in our (\w+)',  # "in our contacts"
+    r'of our (\w+)',  # "of our accounts"
+    r'for (\w+)',  # "for contacts"
+    r'about (\w+)',  # "about leads"
+    r'in (\w+)',  # "in Contact"
+    r'on (\w+)',  # "on Account" - FIXED!
+    r'(\w+) have',  # "Contact have"
+    r'(\w+) fields',  # "Contact fields"
+    r'(\w+) object',  # "contact object" (redundant but explicit)
+    r'contact',  # Direct match for "contact"
+)]
+
 class RAGService:
     """Service class for RAG operations with multiple LLM providers"""
     
@@ -47,31 +87,12 @@ class RAGService:
         """Normalize profile names in the query to match actual Salesforce profile names"""
         query_lower = query.lower()
         
-        # Profile name mapping - map common aliases to actual profile names
-        # Order matters: longer, more specific patterns first
-        profile_mappings = [
-            ('admin profile', 'system administrator'),
-            ('sys admin', 'system administrator'),
-            ('system admin', 'system administrator'),
-            ('administrator', 'system administrator'),
-            ('admin', 'system administrator'),
-            ('standard user', 'standard user'),
-            ('read only', 'read only'),
-            ('marketing user', 'marketing user'),
-            ('sales user', 'custom: sales profile'),
-            ('support user', 'custom: support profile'),
-            ('contract manager', 'contract manager'),
-            ('solution manager', 'solution manager')
-        ]
-        
         # Apply profile name mapping to the query (only first match)
         normalized_query = query
-        for alias, actual_name in profile_mappings:
+        for alias, actual_name in PROFILE_MAPPINGS:
             if alias in query_lower:
                 # Replace the alias with the actual profile name (case-insensitive)
-                import re
-                pattern = re.compile(re.escape(alias), re.IGNORECASE)
-                normalized_query = pattern.sub(actual_name, normalized_query, count=1)  # Only replace first occurrence
+                normalized_query = _PROFILE_ALIAS_RES[alias].sub(actual_name, normalized_query, count=1)  # Only replace first occurrence
                 logger.info(f"🔍 Profile mapping: '{alias}' -> '{actual_name}'")
                 break  # Only apply one mapping to avoid conflicts
         
@@ -116,9 +137,7 @@ class RAGService:
         results = []
         
         # Pattern 1: "fields in [Object]" -> salesforce_object_[Object]
-        import re
-        field_pattern = r'fields?\s+in\s+(?:my\s+)?(\w+)\s+object'
-        match = re.search(field_pattern, query_lower)
+        match = _FIELDS_IN_OBJECT_RE.search(query_lower)
         if match:
             object_name = match.group(1)
             doc_id = f"salesforce_object_{object_name.capitalize()}"
@@ -128,8 +147,7 @@ class RAGService:
                 logger.info(f"🔍 DIRECT LOOKUP: Found {doc_id} for 'fields in {object_name}' query")
         
         # Pattern 2: "Admin profile edit on [Object]" -> security_[Object]
-        admin_pattern = r'(?:admin|system\s+administrator).*?(?:edit|permission).*?(?:on\s+)?(\w+)'
-        match = re.search(admin_pattern, query_lower)
+        match = _ADMIN_PERMISSION_RE.search(query_lower)
         if match:
             object_name = match.group(1)
             doc_id = f"security_{object_name.capitalize()}"
@@ -139,8 +157,7 @@ class RAGService:
                 logger.info(f"🔍 DIRECT LOOKUP: Found {doc_id} for 'Admin profile {object_name}' query")
         
         # Pattern 3: Direct object name queries
-        object_pattern = r'\b(account|contact|lead|opportunity|case|user|profile)\b'
-        matches = re.findall(object_pattern, query_lower)
+        matches = _DIRECT_OBJECT_RE.findall(query_lower)
         for obj_name in matches:
             # Try both object and security documents
             for prefix in ["salesforce_object_", "security_"]:
@@ -224,6 +241,8 @@ class RAGService:
                 logger.info(f"Using OpenAI model: {self.available_providers['openai']['model']} with {config.MAX_TOKENS} max tokens")
                 
             elif "anthropic" in self.available_providers:
+                # Provider SDKs are only imported when selected
+                from langchain_anthropic import ChatAnthropic
                 self.llm = ChatAnthropic(
                     model=self.available_providers["anthropic"]["model"],
                     temperature=config.TEMPERATURE,
@@ -233,6 +252,7 @@ class RAGService:
                 logger.info(f"Using Anthropic model: {self.available_providers['anthropic']['model']} with {config.MAX_TOKENS} max tokens")
                 
             elif "google" in self.available_providers:
+                from langchain_google_genai import ChatGoogleGenerativeAI
                 self.llm = ChatGoogleGenerativeAI(
                     model=self.available_providers["google"]["model"],
                     temperature=config.TEMPERATURE,
@@ -250,7 +270,7 @@ class RAGService:
     
     def search_context(self, query: str, top_k: int = 10) -> List[Document]:
         """Enhanced search context with optimized strategies for large databases"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             if not self.vector_store:
@@ -266,7 +286,7 @@ class RAGService:
             cache_key = self._get_cache_key(normalized_query, top_k)
             cached_result = self._get_cached_result(cache_key)
             if cached_result:
-                logger.info(f"🔍 Cache hit! Returning cached results in {time.time() - start_time:.2f}s")
+                logger.info(f"🔍 Cache hit! Returning cached results in {time.perf_counter() - start_time:.2f}s")
                 return cached_result
             
             logger.info(f"🔍 Cache miss. Performing fresh search...")
@@ -286,7 +306,7 @@ class RAGService:
             if direct_results:
                 logger.info(f"🔍 DIRECT LOOKUP: Found {len(direct_results)} documents via direct lookup")
                 self._cache_search_result(cache_key, direct_results)
-                logger.info(f"🔍 Direct lookup completed in {time.time() - start_time:.2f}s")
+                logger.info(f"🔍 Direct lookup completed in {time.perf_counter() - start_time:.2f}s")
                 return direct_results
             else:
                 logger.info(f"🔍 DIRECT LOOKUP: No direct lookup results, proceeding to object-specific search")
@@ -296,29 +316,8 @@ class RAGService:
             target_objects = []
             
             # Enhanced object detection with better patterns
-            import re
-            # Look for object names in quotes, after "for the", or standalone
-            object_patterns = [
-                r'"([^"]+)"',  # Objects in quotes
-                r'for the (\w+) object',  # "for the Account object"
-                r'the (\w+) object',  # "the Contact object"
-                r'(\w+) object',  # "Account object"
-                r'(\w+) records?',  # "Lead records"
-                r'(\w+) data',  # "Account data"
-                r'in our (\w+)',  # "in our contacts"
-                r'of our (\w+)',  # "of our accounts"
-                r'for (\w+)',  # "for contacts"
-                r'about (\w+)',  # "about leads"
-                r'in (\w+)',  # "in Contact"
-                r'on (\w+)',  # "on Account" - FIXED!
-                r'(\w+) have',  # "Contact have"
-                r'(\w+) fields',  # "Contact fields"
-                r'(\w+) object',  # "contact object" (redundant but explicit)
-                r'contact',  # Direct match for "contact"
-            ]
-            
-            for pattern in object_patterns:
-                matches = re.findall(pattern, query_lower)
+            for pattern in _OBJECT_NAME_RES:
+                matches = pattern.findall(query_lower)
                 target_objects.extend(matches)
             
             # Remove duplicates and filter out common words
@@ -413,7 +412,7 @@ class RAGService:
                         logger.info(f"🔍 Found {len(security_results)} object-specific security documents")
                         results = security_results[:top_k]
                         self._cache_search_result(cache_key, results)
-                        logger.info(f"🔍 Security search completed in {time.time() - start_time:.2f}s")
+                        logger.info(f"🔍 Security search completed in {time.perf_counter() - start_time:.2f}s")
                         return results
                 
                 # OPTIMIZATION 3: Try direct document fetch for specific security documents
@@ -444,7 +443,7 @@ class RAGService:
                         logger.info(f"🔍 Found {len(security_results)} direct security documents")
                         results = security_results[:top_k]
                         self._cache_search_result(cache_key, results)
-                        logger.info(f"🔍 Direct security search completed in {time.time() - start_time:.2f}s")
+                        logger.info(f"🔍 Direct security search completed in {time.perf_counter() - start_time:.2f}s")
                         return results
 
                 # OPTIMIZATION 4: Fallback to general security search with better filtering
@@ -503,7 +502,7 @@ class RAGService:
                     logger.info(f"🔍 Document types found: {doc_types}")
                     results = security_results[:top_k]
                     self._cache_search_result(cache_key, results)
-                    logger.info(f"🔍 Security search completed in {time.time() - start_time:.2f}s")
+                    logger.info(f"🔍 Security search completed in {time.perf_counter() - start_time:.2f}s")
                     return results
                 else:
                     logger.warning("🔍 No security-related documents found!")
@@ -588,15 +587,19 @@ class RAGService:
                 if len(results) > top_k:
                     results = results[:top_k]
                 
-                # Check if we found the specific target objects we were looking for
+                # Check if we found the specific target objects we were looking for,
+                # stopping as soon as every target has been seen
+                target_objects_lower = [target_obj.lower() for target_obj in target_objects]
                 found_target_objects = set()
                 for doc in results:
                     object_name = doc.metadata.get('object_name', '').lower()
                     doc_id = doc.metadata.get('id', '').lower()
-                    for target_obj in target_objects:
-                        if (object_name == target_obj.lower() or 
-                            target_obj.lower() in doc_id):
-                            found_target_objects.add(target_obj.lower())
+                    for target_obj in target_objects_lower:
+                        if (object_name == target_obj or 
+                            target_obj in doc_id):
+                            found_target_objects.add(target_obj)
+                    if len(found_target_objects) == len(target_objects):
+                        break
                 
                 if results and len(found_target_objects) == len(target_objects):
                     # Found all target objects
@@ -607,7 +610,7 @@ class RAGService:
                         object_name = doc.metadata.get('object_name', 'unknown')
                         logger.info(f"🔍 OBJECT-SPECIFIC: Doc {i+1}: ID={doc_id}, Object={object_name}")
                     self._cache_search_result(cache_key, results)
-                    logger.info(f"🔍 Object-specific search completed in {time.time() - start_time:.2f}s")
+                    logger.info(f"🔍 Object-specific search completed in {time.perf_counter() - start_time:.2f}s")
                     return results
                 elif results:
                     # Found some results but not all target objects
@@ -646,7 +649,7 @@ class RAGService:
                     if results:
                         logger.info(f"🔍 OBJECT-SPECIFIC: Retrieved {len(results)} target objects via direct fetch")
                         self._cache_search_result(cache_key, results)
-                        logger.info(f"🔍 Object-specific search completed in {time.time() - start_time:.2f}s")
+                        logger.info(f"🔍 Object-specific search completed in {time.perf_counter() - start_time:.2f}s")
                         return results
                     
                     # Try a broader search as fallback
@@ -663,7 +666,7 @@ class RAGService:
                                     logger.info(f"🔍 BROADER SEARCH: Doc: ID={doc_id}, Object={object_name}")
                                 results = broader_results[:top_k]
                                 self._cache_search_result(cache_key, results)
-                                logger.info(f"🔍 Broader search completed in {time.time() - start_time:.2f}s")
+                                logger.info(f"🔍 Broader search completed in {time.perf_counter() - start_time:.2f}s")
                                 return results
                         except Exception as e:
                             logger.warning(f"Error in broader search for {target_obj}: {e}")
@@ -706,7 +709,7 @@ class RAGService:
                             if contact_results:
                                 logger.info(f"🔍 SPECIAL FALLBACK: Retrieved Contact object")
                                 self._cache_search_result(cache_key, contact_results)
-                                logger.info(f"🔍 Special fallback completed in {time.time() - start_time:.2f}s")
+                                logger.info(f"🔍 Special fallback completed in {time.perf_counter() - start_time:.2f}s")
                                 return contact_results
                             else:
                                 # ULTIMATE FALLBACK: Try direct fetch from Pinecone
@@ -735,7 +738,7 @@ class RAGService:
                                         
                                         logger.info("🔍 ULTIMATE FALLBACK: Successfully fetched Contact object directly!")
                                         self._cache_search_result(cache_key, [contact_doc])
-                                        logger.info(f"🔍 Ultimate fallback completed in {time.time() - start_time:.2f}s")
+                                        logger.info(f"🔍 Ultimate fallback completed in {time.perf_counter() - start_time:.2f}s")
                                         return [contact_doc]
                                     else:
                                         logger.warning("🔍 ULTIMATE FALLBACK: Contact object not found in direct fetch")
@@ -752,7 +755,7 @@ class RAGService:
             logger.info(f"🔍 Fallback search found {len(results)} documents")
             
             self._cache_search_result(cache_key, results)
-            logger.info(f"🔍 Fallback search completed in {time.time() - start_time:.2f}s")
+            logger.info(f"🔍 Fallback search completed in {time.perf_counter() - start_time:.2f}s")
             return results
             
         except Exception as e:
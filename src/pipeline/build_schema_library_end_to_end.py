@@ -33,22 +33,34 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import atexit
 import aiohttp
 import concurrent.futures
 import csv
+import functools
+import io
+import itertools
 import json
 import os
+import queue
 import re
 import shutil
+import signal
 import subprocess
-import sys
+import tempfile
+import threading
 import time
-from collections import Counter, deque, defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import weakref
+from collections import defaultdict
+from datetime import datetime
+from email.utils import formatdate
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
 import logging
+import logging.handlers
 
 # Load environment variables from .env file if present
 try:
@@ -74,6 +86,30 @@ except ImportError:
     TIKTOKEN_AVAILABLE = False
     print("Warning: tiktoken not installed. Using character-based token estimation.")
 
+# Fast JSON (de)serialization for CLI output and corpus lines (optional)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Streaming JSON parsing for large CLI query results (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Vectorized stats computation (optional)
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
 # SmartCache imports
 try:
     from smart_cache import SmartCache, create_cache_for_pipeline
@@ -82,23 +118,60 @@ except ImportError:
     SMARTCACHE_AVAILABLE = False
     print("Warning: SmartCache not available. Caching will be disabled.")
 
-# Configure logging
+# Configure logging; records are queued and written to the console and
+# pipeline.log by a listener thread, so worker threads never block on I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler('pipeline.log'),
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('pipeline.log')
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# DEBUG output (e.g. every CLI command line) is opt-in via SF_DEBUG=1
+if os.getenv("SF_DEBUG") == "1":
+    logger.setLevel(logging.DEBUG)
+
 # ----------------------------
 # CLI resolution & helpers
 # ----------------------------
 
 SF_BIN: Optional[str] = None
 
+# Resolved CLI path persisted across runs so warm starts skip the PATH probes
+SF_BIN_CACHE_FILE = Path.home() / ".cache" / "sf_bin_path"
+
+def _read_cached_sf_bin() -> Optional[str]:
+    """Return the previously resolved CLI path if it is still an executable file.
+
+    A path left stale by an upgrade or uninstall returns None so the caller re-probes.
+    """
+    try:
+        cached = SF_BIN_CACHE_FILE.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    if cached and os.path.isfile(cached) and os.access(cached, os.X_OK):
+        return cached
+    if cached:
+        logger.debug("Cached SF CLI path %s is no longer executable; re-probing", cached)
+    return None
+
+def _write_cached_sf_bin(sf_bin: str):
+    """Persist the resolved CLI path for subsequent runs."""
+    try:
+        SF_BIN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SF_BIN_CACHE_FILE.write_text(sf_bin, encoding='utf-8')
+    except OSError as e:
+        logger.debug("Could not persist SF CLI path to %s: %s", SF_BIN_CACHE_FILE, e)
+
+@functools.lru_cache(maxsize=1)
 def resolve_sf(sf_path_opt: str = "") -> str:
     """Resolve path to Salesforce CLI executable/shim."""
     if sf_path_opt:
@@ -107,11 +180,18 @@ def resolve_sf(sf_path_opt: str = "") -> str:
             return str(p)
         raise SystemExit(f"--sf-path '{sf_path_opt}' doesn't exist.")
     
+    cached = _read_cached_sf_bin()
+    if cached:
+        return cached
+    
     for name in ["sf.cmd", "sf.exe", "sf.ps1", "sf", "sfdx.cmd", "sfdx.exe", "sfdx"]:
         try:
-            result = subprocess.run([name, "--version"], capture_output=True, text=True, timeout=5)
+            # Only the exit status matters, so the version banner is discarded
+            result = subprocess.run([name, "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
             if result.returncode == 0:
-                return name
+                sf_bin = shutil.which(name) or name
+                _write_cached_sf_bin(sf_bin)
+                return sf_bin
         except (subprocess.TimeoutExpired, FileNotFoundError):
             continue
     
@@ -125,7 +205,8 @@ def run_sf(args: List[str], org: str = "", timeout: int = 300, max_retries: int
     
     for attempt in range(max_retries):
         try:
-            logger.debug(f"Running command (attempt {attempt + 1}/{max_retries}): {' '.join(cmd)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Running command (attempt %d/%d): %s", attempt + 1, max_retries, ' '.join(cmd))
             # Use encoding='utf-8' and errors='replace' to handle Unicode issues on Windows
             result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=timeout)
             
@@ -152,55 +233,181 @@ def run_sf(args: List[str], org: str = "", timeout: int = 300, max_retries: int
             logger.error(f"SF command timed out: {' '.join(cmd)}")
             raise
 
+# Read-only describe/list commands whose output may be memoized by run_sf_cached
+CACHEABLE_SF_COMMANDS = frozenset({
+    ("org", "list"),
+    ("sobject", "describe"),
+    ("sobject", "list"),
+})
+
+@functools.lru_cache(maxsize=16)
+def _run_sf_memoized(args: Tuple[str, ...], org: str) -> str:
+    return run_sf(list(args), org)
+
+def run_sf_cached(args: Tuple[str, ...], org: str = "") -> str:
+    """Run a read-only describe/list CLI command once per process and reuse its output.
+
+    State-changing commands are rejected rather than silently skipped on repeat
+    calls; the cache is bounded and failures are not cached.
+    """
+    if tuple(args[:2]) not in CACHEABLE_SF_COMMANDS:
+        raise ValueError(f"run_sf_cached only accepts read-only describe/list commands, got: {' '.join(args)}")
+    return _run_sf_memoized(tuple(args), org)
+
+def _run_sf_concurrently(commands: List[List[str]], org: str = "") -> List[str]:
+    """Run independent sf commands side by side so their CLI start-up overlaps.
+
+    Results come back in command order; the first failure is re-raised.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        futures = [executor.submit(run_sf, command, org) for command in commands]
+        return [future.result() for future in futures]
+
+# Leading stdout bytes kept while streaming; with --json, sf writes its error payload there
+SF_STREAM_ERROR_CAPTURE_BYTES = 64 * 1024
+
+class _HeadCapture:
+    """File wrapper that keeps the first ``limit`` bytes read through it."""
+    
+    def __init__(self, stream, limit: int):
+        self.stream = stream
+        self.limit = limit
+        self.head = bytearray()
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        if len(self.head) < self.limit:
+            self.head += chunk[:self.limit - len(self.head)]
+        return chunk
+
+def iter_sf_records(args: List[str], org: str = "", timeout: int = 300) -> Iterator[dict]:
+    """Yield the records of a ``data query --json`` CLI call while its stdout is still being parsed.
+
+    With ijson the CLI output is never held as one string plus one parsed tree.
+    ``timeout`` bounds the whole stream: a CLI still running at the deadline is killed
+    and TimeoutExpired raised. A rate-limited call that has not yielded anything yet is
+    handed to run_sf for its backoff retries; other failures raise CalledProcessError
+    carrying the CLI's JSON error output and stderr.
+    """
+    if not IJSON_AVAILABLE:
+        yield from _json_loads(run_sf(args, org, timeout))["result"]["records"]
+        return
+    
+    cmd = [SF_BIN] + args
+    if org:
+        cmd.extend(["-o", org])
+    
+    with tempfile.TemporaryFile() as stderr_file:
+        # On POSIX the CLI gets its own process group so the kill also reaches the node
+        # process behind the sf wrapper script, which would otherwise keep stdout open
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, start_new_session=os.name == 'posix')
+        timed_out = threading.Event()
+        
+        def kill():
+            try:
+                if os.name == 'posix':
+                    os.killpg(proc.pid, signal.SIGKILL)
+                else:
+                    proc.kill()
+            except OSError:
+                pass
+        
+        def kill_on_deadline():
+            timed_out.set()
+            kill()
+        
+        # proc.wait(timeout) would only start counting at EOF, so a hung CLI is killed by a timer instead
+        deadline = threading.Timer(timeout, kill_on_deadline)
+        deadline.daemon = True
+        deadline.start()
+        stdout = _HeadCapture(proc.stdout, SF_STREAM_ERROR_CAPTURE_BYTES)
+        yielded = 0
+        parse_error = None
+        try:
+            try:
+                for record in ijson.items(stdout, "result.records.item", use_float=True):
+                    yielded += 1
+                    yield record
+            except ijson.JSONError as e:
+                # Reported below as the timeout or CLI failure that cut the output short, if any
+                parse_error = e
+        finally:
+            deadline.cancel()
+            # Don't leave the CLI blocked on a full pipe if the consumer stopped early
+            if proc.poll() is None:
+                kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+        
+        if timed_out.is_set():
+            logger.error(f"SF command timed out: {' '.join(cmd)}")
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if returncode != 0:
+            output = stdout.head.decode('utf-8', errors='replace')
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+            if not yielded and ("REQUEST_LIMIT_EXCEEDED" in output or "REQUEST_LIMIT_EXCEEDED" in stderr):
+                logger.warning(f"Rate limit exceeded, retrying with backoff: {' '.join(cmd)}")
+                yield from _json_loads(run_sf(args, org, timeout))["result"]["records"]
+                return
+            logger.error(f"SF command failed: {' '.join(cmd)}")
+            logger.error(f"STDOUT: {output}")
+            logger.error(f"STDERR: {stderr}")
+            raise subprocess.CalledProcessError(returncode, cmd, output, stderr)
+        if parse_error is not None:
+            raise parse_error
+
 # ----------------------------
 # Smart API Batching Functions
 # ----------------------------
 
+# Lines whose first non-blank characters open a // or /* comment
+_COMMENT_LINE_RE = re.compile(r"^[^\S\n]*(?://|/\*)", re.MULTILINE)
+
 def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[str, dict]:
     """Get automation data for multiple objects in single API calls."""
     logger.info(f"Fetching automation data for {len(object_names)} objects using batched API calls")
     
+    # Serialize the object list once and reuse it in every query's IN clause
+    object_list = ','.join(f"'{name}'" for name in object_names)
+    
     # Single query for all flows across all objects
     flows_query = f"""
     SELECT Name, Description, TriggerObjectOrEvent.QualifiedApiName, ProcessType, Status
     FROM Flow 
     WHERE ProcessType = 'AutoLaunchedFlow' 
-    AND TriggerObjectOrEvent.QualifiedApiName IN ({','.join(f"'{name}'" for name in object_names)})
+    AND TriggerObjectOrEvent.QualifiedApiName IN ({object_list})
     """
     
     # Single query for all triggers across all objects
     triggers_query = f"""
     SELECT Name, TableEnumOrId, Body, Status
     FROM ApexTrigger 
-    WHERE TableEnumOrId IN ({','.join(f"'{name}'" for name in object_names)})
+    WHERE TableEnumOrId IN ({object_list})
     """
     
     # Single query for all validation rules across all objects
     validation_query = f"""
     SELECT Name, EntityDefinition.QualifiedApiName, ErrorDisplayField, ErrorMessage
     FROM ValidationRule 
-    WHERE EntityDefinition.QualifiedApiName IN ({','.join(f"'{name}'" for name in object_names)})
+    WHERE EntityDefinition.QualifiedApiName IN ({object_list})
     """
     
     # Single query for all workflow rules across all objects
     workflow_query = f"""
     SELECT Name, TableEnumOrId, Active
     FROM WorkflowRule 
-    WHERE TableEnumOrId IN ({','.join(f"'{name}'" for name in object_names)})
+    WHERE TableEnumOrId IN ({object_list})
     """
     
-    # Execute batched queries
+    # Execute batched queries concurrently
     try:
-        flows_result = run_sf(["data", "query", "--query", flows_query, "--json"], org)
-        triggers_result = run_sf(["data", "query", "--query", triggers_query, "--json"], org)
-        validation_result = run_sf(["data", "query", "--query", validation_query, "--json"], org)
-        workflow_result = run_sf(["data", "query", "--query", workflow_query, "--json"], org)
+        flows_data, triggers_data, validation_data, workflow_data = run_soql_batch(
+            org, [flows_query, triggers_query, validation_query, workflow_query]
+        )
         
-        # Parse results
-        flows_data = json.loads(flows_result)["result"]["records"]
-        triggers_data = json.loads(triggers_result)["result"]["records"]
-        validation_data = json.loads(validation_result)["result"]["records"]
-        workflow_data = json.loads(workflow_result)["result"]["records"]
+        # Hash lookup for the per-record object filter (object_names is a list)
+        requested_objects = frozenset(object_names)
         
         # Group results by object
         grouped_results = defaultdict(lambda: {
@@ -214,7 +421,7 @@ def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[s
         # Group flows by object
         for flow in flows_data:
             object_name = flow.get("TriggerObjectOrEvent", {}).get("QualifiedApiName")
-            if object_name and object_name in object_names:
+            if object_name in requested_objects:
                 grouped_results[object_name]["flows"].append({
                     "name": flow["Name"],
                     "description": flow.get("Description", ""),
@@ -224,7 +431,7 @@ def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[s
         # Group triggers by object
         for trigger in triggers_data:
             object_name = trigger.get("TableEnumOrId")
-            if object_name and object_name in object_names:
+            if object_name in requested_objects:
                 grouped_results[object_name]["triggers"].append({
                     "name": trigger["Name"],
                     "body": trigger.get("Body", ""),
@@ -234,9 +441,8 @@ def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[s
                 # Calculate code complexity for triggers
                 body = trigger.get("Body", "")
                 if body:
-                    lines = body.split('\n')
-                    total_lines = len(lines)
-                    comment_lines = len([line for line in lines if line.strip().startswith('//') or line.strip().startswith('/*')])
+                    total_lines = body.count('\n') + 1
+                    comment_lines = len(_COMMENT_LINE_RE.findall(body))
                     grouped_results[object_name]["code_complexity"]["triggers"].append({
                         "name": trigger["Name"],
                         "total_lines": total_lines,
@@ -246,7 +452,7 @@ def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[s
         # Group validation rules by object
         for rule in validation_data:
             object_name = rule.get("EntityDefinition", {}).get("QualifiedApiName")
-            if object_name and object_name in object_names:
+            if object_name in requested_objects:
                 grouped_results[object_name]["validation_rules"].append({
                     "name": rule["Name"],
                     "error_message": rule.get("ErrorMessage", ""),
@@ -256,7 +462,7 @@ def get_all_automation_data_batched(org: str, object_names: List[str]) -> Dict[s
         # Group workflow rules by object
         for rule in workflow_data:
             object_name = rule.get("TableEnumOrId")
-            if object_name and object_name in object_names:
+            if object_name in requested_objects:
                 grouped_results[object_name]["workflow_rules"].append({
                     "name": rule["Name"],
                     "active": rule.get("Active", False)
@@ -288,6 +494,32 @@ def get_field_permissions_via_metadata_api(org: str, object_names: List[str]) ->
     # Use the new CLI-based function for detailed field permissions
     return get_detailed_field_permissions_via_cli(org, object_names)
 
+def compute_field_fill_rates(sample_records: List[dict]) -> Dict[str, dict]:
+    """Compute per-field fill rates (value not None and not '') over a sample of records."""
+    if not sample_records:
+        return {}
+    
+    fields = [field for field in sample_records[0].keys() if field != 'attributes']
+    total_count = len(sample_records)
+    if PANDAS_AVAILABLE:
+        # One vectorized pass per column instead of a Python loop per record per field
+        df = pd.DataFrame.from_records(sample_records, columns=fields)
+        filled_counts = (df.notna() & df.ne('')).sum().to_dict()
+    else:
+        filled_counts = {
+            field: sum(1 for record in sample_records if record.get(field) is not None and record.get(field) != '')
+            for field in fields
+        }
+    
+    return {
+        field: {
+            "filled_count": int(filled_counts[field]),
+            "total_count": total_count,
+            "fill_rate": int(filled_counts[field]) / total_count
+        }
+        for field in fields
+    }
+
 def get_all_stats_data_batched(org: str, object_names: List[str], sample_n: int = 100) -> Dict[str, dict]:
     """Get stats data for multiple objects using batched queries."""
     logger.info(f"Fetching stats data for {len(object_names)} objects using batched API calls")
@@ -299,7 +531,7 @@ def get_all_stats_data_batched(org: str, object_names: List[str], sample_n: int
             # Get record count
             count_query = f"SELECT COUNT() FROM {object_name}"
             count_result = run_sf(["data", "query", "--query", count_query, "--json"], org)
-            count_data = json.loads(count_result)
+            count_data = _json_loads(count_result)
             if count_data["result"]["records"]:
                 record_count = count_data["result"]["records"][0]["expr0"]
             else:
@@ -312,7 +544,7 @@ def get_all_stats_data_batched(org: str, object_names: List[str], sample_n: int
             WHERE EntityDefinition.QualifiedApiName = '{object_name}'
             """
             field_result = run_sf(["data", "query", "--query", field_query, "--json"], org)
-            field_data = json.loads(field_result)
+            field_data = _json_loads(field_result)
             if field_data["result"]["records"]:
                 field_count = field_data["result"]["records"][0]["expr0"]
             else:
@@ -321,19 +553,10 @@ def get_all_stats_data_batched(org: str, object_names: List[str], sample_n: int
             # Get sample data for field fill rates
             sample_query = f"SELECT * FROM {object_name} LIMIT {sample_n}"
             sample_result = run_sf(["data", "query", "--query", sample_query, "--json"], org)
-            sample_records = json.loads(sample_result)["result"]["records"]
+            sample_records = _json_loads(sample_result)["result"]["records"]
             
             # Calculate field fill rates
-            field_fill_rates = {}
-            if sample_records:
-                for field in sample_records[0].keys():
-                    if field not in ['attributes']:
-                        filled_count = sum(1 for record in sample_records if record.get(field) is not None and record.get(field) != '')
-                        field_fill_rates[field] = {
-                            "filled_count": filled_count,
-                            "total_count": len(sample_records),
-                            "fill_rate": filled_count / len(sample_records) if sample_records else 0
-                        }
+            field_fill_rates = compute_field_fill_rates(sample_records)
             
             grouped_results[object_name] = {
                 "record_count": record_count,
@@ -410,6 +633,10 @@ def get_object_permissions_from_profiles_and_permission_sets_enhanced(org: str,
         logger.info("Falling back to basic profile and permission set queries...")
         return get_basic_profiles_and_permission_sets(org, object_names)
 
+# Profile user types inferred to have create/edit access when detailed
+# permission fields are unavailable
+WRITE_CAPABLE_USER_TYPES = frozenset({'Standard', 'PowerPartner', 'PowerCustomerSuccess'})
+
 def get_profiles_with_object_permissions_enhanced(org: str, object_names: List[str]) -> Dict[str, dict]:
     """Get profiles with basic information since detailed permission fields are not available in this org."""
     profiles_data = {}
@@ -418,13 +645,14 @@ def get_profiles_with_object_permissions_enhanced(org: str, object_names: List[s
         # Query all profiles - just get basic info
         profiles_query = "SELECT Id, Name, UserType FROM Profile WHERE UserType != 'Guest'"
         profiles_result = run_sf(["data", "query", "--query", profiles_query, "--json"], org)
-        profiles = json.loads(profiles_result)["result"]["records"]
+        profiles = _json_loads(profiles_result)["result"]["records"]
         
         logger.info(f"Found {len(profiles)} profiles to analyze")
         
         for profile in profiles:
             profile_name = profile['Name']
             profile_id = profile['Id']
+            can_write = profile['UserType'] in WRITE_CAPABLE_USER_TYPES
             
             # Since detailed permission fields don't exist, use inferred permissions based on UserType
             for object_name in object_names:
@@ -434,9 +662,9 @@ def get_profiles_with_object_permissions_enhanced(org: str, object_names: List[s
                 profiles_data[object_name][profile_name] = {
                     'profile_id': profile_id,
                     'user_type': profile['UserType'],
-                    'create': profile['UserType'] in ['Standard', 'PowerPartner', 'PowerCustomerSuccess'],
+                    'create': can_write,
                     'read': True,  # Most profiles have read access
-                    'edit': profile['UserType'] in ['Standard', 'PowerPartner', 'PowerCustomerSuccess'],
+                    'edit': can_write,
                     'delete': profile['UserType'] == 'Standard',  # Only Standard profiles typically have delete
                     'source': 'inferred_from_user_type',
                     'note': 'Detailed permission fields not available in this org - using UserType-based inference'
@@ -456,7 +684,7 @@ def get_permission_sets_with_object_permissions_enhanced(org: str, object_names:
         # Query all permission sets
         permission_sets_query = "SELECT Id, Name, Label FROM PermissionSet WHERE IsOwnedByProfile = false"
         permission_sets_result = run_sf(["data", "query", "--query", permission_sets_query, "--json"], org)
-        permission_sets = json.loads(permission_sets_result)["result"]["records"]
+        permission_sets = _json_loads(permission_sets_result)["result"]["records"]
         
         logger.info(f"Found {len(permission_sets)} permission sets to analyze")
         
@@ -503,7 +731,7 @@ def get_field_permissions_via_tooling(org: str, object_names: List[str]) -> Dict
             field_permissions_data[object_name] = []
             
             # Note: Detailed field permissions not available - FieldPermissions sObject not supported
-            logger.debug(f"Skipping detailed field permissions for {object_name} - FieldPermissions sObject not supported")
+            logger.debug("Skipping detailed field permissions for %s - FieldPermissions sObject not supported", object_name)
         
         return field_permissions_data
         
@@ -516,7 +744,7 @@ def get_profiles_metadata(org: str) -> List[dict]:
     try:
         # List all profiles
         profiles_list = run_sf(["org", "list", "metadata", "--metadata-type", "Profile", "--json"], org)
-        profiles_data = json.loads(profiles_list)
+        profiles_data = _json_loads(profiles_list)
         
         profiles_metadata = []
         for profile in profiles_data.get('result', []):
@@ -524,7 +752,7 @@ def get_profiles_metadata(org: str) -> List[dict]:
                 # Retrieve profile metadata
                 profile_name = profile['fullName']
                 profile_metadata = run_sf(["org", "retrieve", "metadata", "--metadata-type", "Profile", "--metadata-names", profile_name, "--json"], org)
-                profile_data = json.loads(profile_metadata)
+                profile_data = _json_loads(profile_metadata)
                 
                 if profile_data.get('result', {}).get('inboundFiles'):
                     profiles_metadata.append({
@@ -547,7 +775,7 @@ def get_permission_sets_metadata(org: str) -> List[dict]:
     try:
         # List all permission sets
         permission_sets_list = run_sf(["org", "list", "metadata", "--metadata-type", "PermissionSet", "--json"], org)
-        permission_sets_data = json.loads(permission_sets_list)
+        permission_sets_data = _json_loads(permission_sets_list)
         
         permission_sets_metadata = []
         for ps in permission_sets_data.get('result', []):
@@ -555,7 +783,7 @@ def get_permission_sets_metadata(org: str) -> List[dict]:
                 # Retrieve permission set metadata
                 ps_name = ps['fullName']
                 ps_metadata = run_sf(["org", "retrieve", "metadata", "--metadata-type", "PermissionSet", "--metadata-names", ps_name, "--json"], org)
-                ps_data = json.loads(ps_metadata)
+                ps_data = _json_loads(ps_metadata)
                 
                 if ps_data.get('result', {}).get('inboundFiles'):
                     permission_sets_metadata.append({
@@ -580,16 +808,17 @@ def get_basic_profiles_and_permission_sets(org: str, object_names: List[str]) ->
     object_permissions = {}
     
     try:
-        # Query all profiles
+        # Query all profiles and permission sets; the two CLI spawns overlap
         profiles_query = "SELECT Id, Name, UserType FROM Profile WHERE UserType != 'Guest'"
-        profiles_result = run_sf(["data", "query", "--query", profiles_query, "--json"], org)
-        profiles = json.loads(profiles_result)["result"]["records"]
-        logger.info(f"Found {len(profiles)} profiles")
-        
-        # Query all permission sets
         permission_sets_query = "SELECT Id, Label, Name FROM PermissionSet WHERE IsOwnedByProfile = false"
-        permission_sets_result = run_sf(["data", "query", "--query", permission_sets_query, "--json"], org)
-        permission_sets = json.loads(permission_sets_result)["result"]["records"]
+        profiles_result, permission_sets_result = _run_sf_concurrently(
+            [["data", "query", "--query", profiles_query, "--json"],
+             ["data", "query", "--query", permission_sets_query, "--json"]],
+            org,
+        )
+        profiles = _json_loads(profiles_result)["result"]["records"]
+        logger.info(f"Found {len(profiles)} profiles")
+        permission_sets = _json_loads(permission_sets_result)["result"]["records"]
         logger.info(f"Found {len(permission_sets)} permission sets")
         
         # For each object, create basic permission structure
@@ -607,9 +836,9 @@ def get_basic_profiles_and_permission_sets(org: str, object_names: List[str]) ->
                 object_permissions[object_name]['profiles'][profile['Name']] = {
                     'profile_id': profile['Id'],
                     'user_type': profile['UserType'],
-                    'create': profile['UserType'] in ['Standard', 'PowerPartner', 'PowerCustomerSuccess'],
+                    'create': profile['UserType'] in WRITE_CAPABLE_USER_TYPES,
                     'read': True,
-                    'edit': profile['UserType'] in ['Standard', 'PowerPartner', 'PowerCustomerSuccess'],
+                    'edit': profile['UserType'] in WRITE_CAPABLE_USER_TYPES,
                     'delete': profile['UserType'] == 'Standard',
                     'source': 'fallback_inferred'
                 }
@@ -637,15 +866,16 @@ def get_all_profiles_and_permission_sets_batched(org: str) -> Dict[str, List[dic
     logger.info("Fetching all profiles and permission sets")
     
     try:
-        # Get profiles
+        # Get profiles and permission sets; the two CLI spawns overlap
         profiles_query = "SELECT Id, Name, Description, UserType FROM Profile ORDER BY Name"
-        profiles_result = run_sf(["data", "query", "--query", profiles_query, "--json"], org)
-        profiles_data = json.loads(profiles_result)["result"]["records"]
-        
-        # Get permission sets
         permission_sets_query = "SELECT Id, Name, Label, Description FROM PermissionSet WHERE IsOwnedByProfile = false ORDER BY Name"
-        permission_sets_result = run_sf(["data", "query", "--query", permission_sets_query, "--json"], org)
-        permission_sets_data = json.loads(permission_sets_result)["result"]["records"]
+        profiles_result, permission_sets_result = _run_sf_concurrently(
+            [["data", "query", "--query", profiles_query, "--json"],
+             ["data", "query", "--query", permission_sets_query, "--json"]],
+            org,
+        )
+        profiles_data = _json_loads(profiles_result)["result"]["records"]
+        permission_sets_data = _json_loads(permission_sets_result)["result"]["records"]
         
         logger.info(f"Found {len(profiles_data)} profiles and {len(permission_sets_data)} permission sets")
         
@@ -668,6 +898,369 @@ async def get_automation_data_async(session: aiohttp.ClientSession, org: str, ob
     # For now, we'll use the batched approach which is more efficient
     return {}
 
+# REST API version used for direct (non-CLI) queries
+SF_API_VERSION = os.getenv("SF_API_VERSION", "58.0")
+
+# Maximum in-flight Salesforce HTTP requests, shared by every async helper
+SF_MAX_CONCURRENCY = int(os.getenv("SF_MAX_CONCURRENCY", "4"))
+
+# asyncio.Semaphore binds to one event loop, and each asyncio.run() starts a new one
+_SF_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _sf_semaphore() -> asyncio.Semaphore:
+    """Return the shared request-limiting semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    sem = _SF_SEMAPHORES.get(loop)
+    if sem is None:
+        sem = _SF_SEMAPHORES[loop] = asyncio.Semaphore(SF_MAX_CONCURRENCY)
+    return sem
+
+# org -> (instance_url, access_token), or the error from resolving it; failures are cached too so
+# describe workers don't each re-spawn a failing `sf org display`
+_ORG_CONNECTIONS: Dict[str, Any] = {}
+_ORG_CONNECTIONS_LOCK = threading.Lock()
+
+def get_org_connection(org: str) -> Tuple[str, str]:
+    """Return (instance_url, access_token) for an org from the authenticated CLI session.
+    
+    Resolved once per process; concurrent first calls wait for the same `sf org display`.
+    """
+    with _ORG_CONNECTIONS_LOCK:
+        if org not in _ORG_CONNECTIONS:
+            try:
+                result = _json_loads(run_sf(["org", "display", "--json"], org))["result"]
+                _ORG_CONNECTIONS[org] = (result["instanceUrl"].rstrip("/"), result["accessToken"])
+            except Exception as e:
+                _ORG_CONNECTIONS[org] = e
+        connection = _ORG_CONNECTIONS[org]
+    if isinstance(connection, Exception):
+        raise RuntimeError(f"Could not resolve REST connection for org {org!r}: {connection}") from connection
+    return connection
+
+# Maximum subrequests accepted by a single Composite Batch request
+COMPOSITE_BATCH_LIMIT = 25
+
+# Setup objects that are only queryable through the Tooling API
+TOOLING_SOBJECTS = frozenset({"Flow", "ValidationRule", "WorkflowRule"})
+_FROM_RE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+def _is_tooling_query(query: str) -> bool:
+    """Whether a SOQL query's FROM object must be queried through the Tooling API."""
+    match = _FROM_RE.search(query)
+    return match is not None and match.group(1) in TOOLING_SOBJECTS
+
+# Large response bodies are decoded on worker threads so the event loop keeps driving other requests
+_PARSE_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="sf-parse")
+PARSE_OFFLOAD_MIN_BYTES = 64 * 1024
+
+async def _parse_off_loop(parse, body):
+    """Run a parser over a response body, off the event loop when the body is large."""
+    if len(body) < PARSE_OFFLOAD_MIN_BYTES:
+        return parse(body)
+    return await asyncio.get_running_loop().run_in_executor(_PARSE_POOL, parse, body)
+
+async def _fetch_remaining_pages(session: aiohttp.ClientSession, instance_url: str, headers: Dict[str, str], payload: dict) -> List[dict]:
+    """Collect the records of a query result, following nextRecordsUrl until done."""
+    records = list(payload.get("records", []))
+    while not payload.get("done", True) and payload.get("nextRecordsUrl"):
+        async with _sf_semaphore(), session.get(f"{instance_url}{payload['nextRecordsUrl']}", headers=headers) as response:
+            response.raise_for_status()
+            body = await response.read()
+        payload = await _parse_off_loop(_json_loads, body)
+        records.extend(payload.get("records", []))
+    return records
+
+async def _run_soql(session: aiohttp.ClientSession, org: str, query: str) -> List[dict]:
+    """Run a SOQL query against the REST API, following pagination, and return all records."""
+    instance_url, access_token = get_org_connection(org)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    api = "tooling/query" if _is_tooling_query(query) else "query"
+    url = f"{instance_url}/services/data/v{SF_API_VERSION}/{api}"
+    
+    async with _sf_semaphore(), session.get(url, params={"q": " ".join(query.split())}, headers=headers) as response:
+        response.raise_for_status()
+        body = await response.read()
+    payload = await _parse_off_loop(_json_loads, body)
+    
+    return await _fetch_remaining_pages(session, instance_url, headers, payload)
+
+async def _composite_batch(session: aiohttp.ClientSession, org: str, queries: List[str],
+                           allow_failures: bool = False) -> List[Optional[List[dict]]]:
+    """Run SOQL queries as Composite Batch subrequests (up to 25 per HTTP call).
+    
+    Tooling API queries are batched separately through the Tooling composite resource.
+    Returns one record list per query, aligned with ``queries``. A failed subrequest
+    raises, or with ``allow_failures`` yields None for that query only.
+    """
+    instance_url, access_token = get_org_connection(org)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    
+    async def run_chunk(chunk: List[str], prefix: str) -> List[List[dict]]:
+        url = f"{instance_url}/services/data/v{SF_API_VERSION}/{prefix}composite/batch"
+        body = {
+            "batchRequests": [
+                {"method": "GET", "url": f"v{SF_API_VERSION}/{prefix}query?{urlencode({'q': query})}"}
+                for query in chunk
+            ]
+        }
+        async with _sf_semaphore(), session.post(url, json=body, headers=headers) as response:
+            response.raise_for_status()
+            response_body = await response.read()
+        payload = await _parse_off_loop(_json_loads, response_body)
+        
+        chunk_results = []
+        for query, sub_result in zip(chunk, payload["results"]):
+            if sub_result.get("statusCode", 500) >= 400:
+                if allow_failures:
+                    logger.debug("Composite subrequest failed (%s) for %s: %s", sub_result.get("statusCode"), query, sub_result.get("result"))
+                    chunk_results.append(None)
+                    continue
+                raise RuntimeError(f"Composite subrequest failed ({sub_result.get('statusCode')}): {sub_result.get('result')}")
+            chunk_results.append(await _fetch_remaining_pages(session, instance_url, headers, sub_result["result"]))
+        return chunk_results
+    
+    # Send each distinct query once, remembering every position that asked for it
+    positions_by_query: Dict[str, List[int]] = {}
+    for position, query in enumerate(queries):
+        positions_by_query.setdefault(" ".join(query.split()), []).append(position)
+    
+    # Split by API so results can come back in input order
+    queries_by_prefix = {"": [], "tooling/": []}
+    for query in positions_by_query:
+        queries_by_prefix["tooling/" if _is_tooling_query(query) else ""].append(query)
+    
+    chunk_tasks = []
+    async with asyncio.TaskGroup() as tg:
+        for prefix, distinct_queries in queries_by_prefix.items():
+            for i in range(0, len(distinct_queries), COMPOSITE_BATCH_LIMIT):
+                chunk = distinct_queries[i:i + COMPOSITE_BATCH_LIMIT]
+                chunk_tasks.append((chunk, tg.create_task(run_chunk(chunk, prefix))))
+    
+    results: List[Optional[List[dict]]] = [[] for _ in queries]
+    for chunk, task in chunk_tasks:
+        for query, records in zip(chunk, task.result()):
+            for position in positions_by_query[query]:
+                results[position] = records
+    return results
+
+def _first_error(error: BaseException) -> BaseException:
+    """Unwrap TaskGroup exception groups to the first underlying error for logging."""
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+async def _run_soql_all(org: str, queries: List[str], allow_failures: bool = False) -> List[Optional[List[dict]]]:
+    """Run several SOQL queries in Composite Batch round trips over one REST session."""
+    async with aiohttp.ClientSession() as session:
+        return await _composite_batch(session, org, queries, allow_failures)
+
+def run_soql_batch(org: str, queries: List[str]) -> List[List[dict]]:
+    """Run SOQL queries via the Composite Batch API, falling back to one CLI call per query.
+    
+    Returns one record list per query, in the same order as ``queries``.
+    """
+    try:
+        return asyncio.run(_run_soql_all(org, queries))
+    except Exception as e:
+        logger.warning(f"REST API query batch failed: {_first_error(e)}")
+        logger.info("Falling back to CLI queries...")
+        return [
+            list(iter_sf_records(["data", "query", "--query", query, "--json"] + (["--use-tooling-api"] if _is_tooling_query(query) else []), org))
+            for query in queries
+        ]
+
+async def get_all_field_level_security_batched_async(org: str, object_names: List[str]) -> Dict[str, dict]:
+    """Get field-level security for multiple objects with one concurrent REST query per object."""
+    logger.info(f"Fetching FLS data for {len(object_names)} objects via REST API (concurrency {SF_MAX_CONCURRENCY})")
+    
+    async def fetch(session: aiohttp.ClientSession, object_name: str) -> Tuple[str, dict]:
+        query = f"""
+        SELECT Field, Parent.Label, Parent.IsOwnedByProfile, Parent.Profile.Name, PermissionsRead, PermissionsEdit
+        FROM FieldPermissions
+        WHERE SobjectType = '{object_name}'
+        """
+        records = await _run_soql(session, org, query)
+        
+        field_permissions = []
+        for perm in records:
+            parent = perm.get("Parent") or {}
+            owned_by_profile = parent.get("IsOwnedByProfile", False)
+            field_permissions.append({
+                "field": perm.get("Field", ""),
+                "profile": (parent.get("Profile") or {}).get("Name", "") if owned_by_profile else "",
+                "permission_set": "" if owned_by_profile else parent.get("Label", ""),
+                "read": perm.get("PermissionsRead", False),
+                "edit": perm.get("PermissionsEdit", False),
+                "source": "rest_api"
+            })
+        return object_name, {"field_permissions": field_permissions}
+    
+    # A failed object cancels the remaining fetches instead of letting them run on
+    async with aiohttp.ClientSession() as session, asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(fetch(session, object_name)) for object_name in object_names]
+    
+    return dict(task.result() for task in tasks)
+
+# Object lists longer than this are swept with one Bulk API 2.0 job instead of per-object REST queries.
+# Object count stands in for the expected result size: ObjectPermissions returns roughly one row per
+# object per profile and permission set, so the row count grows linearly with the number of objects,
+# and counting rows up front would cost an extra query per object.
+BULK_QUERY_OBJECT_THRESHOLD = 8
+BULK_POLL_INTERVAL_SECONDS = 2
+# A job still queued or in progress after this long is aborted rather than polled forever
+BULK_MAX_WAIT_SECONDS = 600
+
+OBJECT_PERMISSIONS_FIELDS = (
+    "SobjectType, Parent.Name, Parent.Label, Parent.IsOwnedByProfile, Parent.Profile.Name, "
+    "PermissionsCreate, PermissionsRead, PermissionsEdit, PermissionsDelete"
+)
+
+def _parse_bulk_csv_record(row: Dict[str, str]) -> dict:
+    """Convert a flat Bulk API CSV row (dotted relationship columns, string booleans) to the REST record shape."""
+    record = {}
+    for column, value in row.items():
+        if value == "true":
+            value = True
+        elif value == "false":
+            value = False
+        elif value == "":
+            value = None
+        
+        target = record
+        *parents, leaf = column.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return record
+
+def _parse_bulk_csv(body: str) -> List[dict]:
+    """Parse one Bulk API CSV result page into REST-shaped records."""
+    return [_parse_bulk_csv_record(row) for row in csv.DictReader(io.StringIO(body))]
+
+async def _abort_bulk_job(session: aiohttp.ClientSession, job_url: str, headers: Dict[str, str]) -> None:
+    """Best-effort abort of a Bulk API 2.0 query job so it stops consuming org resources."""
+    try:
+        async with _sf_semaphore(), session.patch(job_url, json={"state": "Aborted"}, headers=headers) as response:
+            response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Could not abort bulk query job at {job_url}: {e}")
+
+async def _run_soql_bulk(session: aiohttp.ClientSession, org: str, query: str) -> List[dict]:
+    """Run a SOQL query as a Bulk API 2.0 query job and return all records."""
+    instance_url, access_token = get_org_connection(org)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    jobs_url = f"{instance_url}/services/data/v{SF_API_VERSION}/jobs/query"
+    
+    async with _sf_semaphore(), session.post(jobs_url, json={"operation": "query", "query": " ".join(query.split())}, headers=headers) as response:
+        response.raise_for_status()
+        job_id = (await response.json())["id"]
+    
+    # Wait for the job to finish, aborting it if it outlives the deadline
+    job_url = f"{jobs_url}/{job_id}"
+    deadline = time.monotonic() + BULK_MAX_WAIT_SECONDS
+    while True:
+        async with _sf_semaphore(), session.get(job_url, headers=headers) as response:
+            response.raise_for_status()
+            state = (await response.json())["state"]
+        if state == "JobComplete":
+            break
+        if state in ("Failed", "Aborted"):
+            raise RuntimeError(f"Bulk query job {job_id} ended in state {state}")
+        if time.monotonic() >= deadline:
+            await _abort_bulk_job(session, job_url, headers)
+            raise TimeoutError(f"Bulk query job {job_id} still {state} after {BULK_MAX_WAIT_SECONDS}s; aborted")
+        await asyncio.sleep(BULK_POLL_INTERVAL_SECONDS)
+    
+    # Stream the CSV result pages
+    records = []
+    params = None
+    while True:
+        async with _sf_semaphore(), session.get(f"{job_url}/results", params=params, headers={**headers, "Accept": "text/csv"}) as response:
+            response.raise_for_status()
+            body = await response.text()
+            locator = response.headers.get("Sforce-Locator")
+        records.extend(await _parse_off_loop(_parse_bulk_csv, body))
+        if not locator or locator == "null":
+            break
+        params = {"locator": locator}
+    
+    logger.info(f"Bulk query job {job_id} returned {len(records)} records")
+    return records
+
+def _group_object_permissions(records: List[dict], object_names: List[str], source: str) -> Dict[str, dict]:
+    """Group ObjectPermissions records into per-object profile and permission set CRUD maps."""
+    object_permissions = {
+        object_name: {
+            'profiles': {},
+            'permission_sets': {},
+            'field_permissions': [],
+            'profiles_metadata': [],
+            'permission_sets_metadata': []
+        }
+        for object_name in object_names
+    }
+    
+    for perm in records:
+        entry = object_permissions.get(perm.get("SobjectType"))
+        if entry is None:
+            continue
+        
+        parent = perm.get("Parent") or {}
+        crud = {
+            'create': perm.get("PermissionsCreate") or False,
+            'read': perm.get("PermissionsRead") or False,
+            'edit': perm.get("PermissionsEdit") or False,
+            'delete': perm.get("PermissionsDelete") or False,
+            'source': source
+        }
+        if parent.get("IsOwnedByProfile"):
+            profile_name = (parent.get("Profile") or {}).get("Name") or parent.get("Name") or ""
+            entry['profiles'][profile_name] = crud
+        else:
+            entry['permission_sets'][parent.get("Label") or ""] = {'name': parent.get("Name") or "", **crud}
+    
+    return object_permissions
+
+async def get_all_object_permissions_batched_async(org: str, object_names: List[str]) -> Dict[str, dict]:
+    """Get object-level permissions for multiple objects via concurrent REST queries or a single Bulk API job."""
+    use_bulk = len(object_names) > BULK_QUERY_OBJECT_THRESHOLD
+    if use_bulk:
+        logger.info(f"Fetching object permissions for {len(object_names)} objects via Bulk API 2.0")
+    else:
+        logger.info(f"Fetching object permissions for {len(object_names)} objects via REST API (concurrency {SF_MAX_CONCURRENCY})")
+    
+    async def fetch(session: aiohttp.ClientSession, object_name: str) -> List[dict]:
+        query = f"SELECT {OBJECT_PERMISSIONS_FIELDS} FROM ObjectPermissions WHERE SobjectType = '{object_name}'"
+        return await _run_soql(session, org, query)
+    
+    async with aiohttp.ClientSession() as session:
+        if use_bulk:
+            object_list = ','.join(f"'{name}'" for name in object_names)
+            query = f"SELECT {OBJECT_PERMISSIONS_FIELDS} FROM ObjectPermissions WHERE SobjectType IN ({object_list})"
+            records = await _run_soql_bulk(session, org, query)
+        else:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(fetch(session, object_name)) for object_name in object_names]
+            records = [record for task in tasks for record in task.result()]
+    
+    return _group_object_permissions(records, object_names, 'bulk_api' if use_bulk else 'rest_api')
+
+def get_security_data_batched(org: str, object_names: List[str]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """Fetch FLS and object permissions concurrently via REST, falling back to the CLI batched queries."""
+    async def fetch_both():
+        async with asyncio.TaskGroup() as tg:
+            fls_task = tg.create_task(get_all_field_level_security_batched_async(org, object_names))
+            object_permissions_task = tg.create_task(get_all_object_permissions_batched_async(org, object_names))
+        return fls_task.result(), object_permissions_task.result()
+    
+    try:
+        fls_data, object_permissions_data = asyncio.run(fetch_both())
+        return fls_data, object_permissions_data
+    except Exception as e:
+        logger.warning(f"REST API security fetch failed: {_first_error(e)}")
+        logger.info("Falling back to CLI batched security queries...")
+        return get_all_field_level_security_batched(org, object_names), get_all_object_permissions_batched(org, object_names)
+
 # ----------------------------
 # SmartCache Integration
 # ----------------------------
@@ -689,10 +1282,33 @@ def get_cached_stats_data(cache: SmartCache, object_name: str, sample_n: int = 1
         return None
     return cache.get_cached_data(object_name, 'stats', sample_n=sample_n)
 
-def cache_stats_data(cache: SmartCache, object_name: str, stats_data: dict, sample_n: int = 100):
-    """Cache stats data for an object."""
+def cache_stats_data(cache: SmartCache, object_name: str, stats_data: dict, sample_n: int = 100,
+                     checksum: Optional[Tuple[str, int]] = None):
+    """Cache stats data for an object, with its (MAX(SystemModstamp), COUNT(Id)) checksum when known."""
     if SMARTCACHE_AVAILABLE and cache:
-        cache.cache_data(object_name, 'stats', stats_data, sample_n=sample_n)
+        modstamp_max, record_count = checksum or (None, None)
+        cache.cache_data(object_name, 'stats', stats_data, modstamp_max=modstamp_max,
+                         record_count=record_count, sample_n=sample_n)
+
+def get_latest_modstamps(org: str, object_names: List[str]) -> Dict[str, Tuple[str, int]]:
+    """Get (MAX(SystemModstamp), COUNT(Id)) per object as a cheap change checksum.
+    
+    The count catches deletions, which leave the latest modstamp unchanged. Objects
+    whose query fails are omitted without affecting the others.
+    """
+    queries = [f"SELECT MAX(SystemModstamp) latest, COUNT(Id) cnt FROM {object_name}" for object_name in object_names]
+    try:
+        # REST only: spawning one CLI process per object would cost more than the refetch it saves
+        results = asyncio.run(_run_soql_all(org, queries, allow_failures=True))
+    except Exception as e:
+        logger.warning(f"Could not fetch SystemModstamp checksums: {_first_error(e)}")
+        return {}
+    
+    checksums = {}
+    for object_name, records in zip(object_names, results):
+        if records and records[0].get("latest"):
+            checksums[object_name] = (records[0]["latest"], records[0].get("cnt"))
+    return checksums
 
 # ----------------------------
 # Main Pipeline Functions
@@ -701,23 +1317,54 @@ def cache_stats_data(cache: SmartCache, object_name: str, stats_data: dict, samp
 def fetch_sobjects(org: str) -> List[str]:
     """Fetch list of SObjects from Salesforce."""
     logger.info("Fetching SObject list...")
-    result = run_sf(["data", "query", "--query", "SELECT QualifiedApiName FROM EntityDefinition WHERE IsQueryable = true ORDER BY QualifiedApiName", "--json"], org)
-    data = json.loads(result)
-    sobjects = [record["QualifiedApiName"] for record in data["result"]["records"]]
+    records = iter_sf_records(["data", "query", "--query", "SELECT QualifiedApiName FROM EntityDefinition WHERE IsQueryable = true ORDER BY QualifiedApiName", "--json"], org)
+    sobjects = [record["QualifiedApiName"] for record in records]
     logger.info(f"Found {len(sobjects)} queryable SObjects")
     return sobjects
 
-def describe_sobject(org: str, sobject_name: str) -> Optional[dict]:
-    """Describe a single SObject."""
+def describe_unchanged_since(org: str, sobject_name: str, since: str) -> bool:
+    """Ask the REST describe resource whether an SObject changed since an HTTP date (304 = unchanged)."""
+    instance_url, access_token = get_org_connection(org)
+    request = Request(
+        f"{instance_url}/services/data/v{SF_API_VERSION}/sobjects/{sobject_name}/describe",
+        headers={"Authorization": f"Bearer {access_token}", "If-Modified-Since": since}
+    )
+    try:
+        # A 200 means it changed; its body is never read
+        with urlopen(request, timeout=60):
+            return False
+    except HTTPError as e:
+        if e.code == 304:
+            return True
+        raise
+
+def describe_sobject(org: str, sobject_name: str, cache: Optional[SmartCache] = None) -> Optional[dict]:
+    """Describe a single SObject, revalidating an expired cached describe with If-Modified-Since."""
+    # Taken before the queries so changes made while they run are caught next time
+    fetched_at = formatdate(usegmt=True)
+    if cache:
+        cached_data = cache.get_cached_data(sobject_name, 'describe')
+        if cached_data:
+            return cached_data['data']
+        
+        stale_data = cache.get_stale_data(sobject_name, 'describe')
+        since = stale_data.get('metadata', {}).get('last_modified') if stale_data else None
+        if since:
+            try:
+                if describe_unchanged_since(org, sobject_name, since) and cache.mark_fresh(sobject_name, 'describe', stale_data):
+                    logger.debug("Describe for %s not modified since %s", sobject_name, since)
+                    return stale_data['data']
+            except Exception as e:
+                logger.debug("Conditional describe failed for %s: %s", sobject_name, e)
+    
     try:
         result = run_sf(["data", "query", "--query", f"SELECT QualifiedApiName, Label FROM EntityDefinition WHERE QualifiedApiName = '{sobject_name}'", "--json"], org)
-        entity_data = json.loads(result)["result"]["records"][0]
+        entity_data = _json_loads(result)["result"]["records"][0]
         
         # Get fields
-        fields_result = run_sf(["data", "query", "--query", f"SELECT QualifiedApiName, Label, DataType, Description FROM FieldDefinition WHERE EntityDefinition.QualifiedApiName = '{sobject_name}' ORDER BY QualifiedApiName", "--json"], org)
-        fields_data = json.loads(fields_result)["result"]["records"]
+        fields_data = list(iter_sf_records(["data", "query", "--query", f"SELECT QualifiedApiName, Label, DataType, Description FROM FieldDefinition WHERE EntityDefinition.QualifiedApiName = '{sobject_name}' ORDER BY QualifiedApiName", "--json"], org))
         
-        return {
+        sobject_schema = {
             "name": entity_data["QualifiedApiName"],
             "label": entity_data["Label"],
             "description": "",  # Description field not available in this org
@@ -734,16 +1381,19 @@ def describe_sobject(org: str, sobject_name: str) -> Optional[dict]:
                 for field in fields_data
             ]
         }
+        if cache:
+            cache.cache_data(sobject_name, 'describe', sobject_schema, last_modified=fetched_at)
+        return sobject_schema
     except Exception as e:
         logger.error(f"Error describing {sobject_name}: {e}")
         return None
 
-def process_objects_parallel(org: str, sobjects: List[str], max_workers: int = 10) -> List[dict]:
+def process_objects_parallel(org: str, sobjects: List[str], max_workers: int = 10, cache: Optional[SmartCache] = None) -> List[dict]:
     """Process objects in parallel using ThreadPoolExecutor."""
     logger.info(f"Processing {len(sobjects)} objects with {max_workers} workers")
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_sobject = {executor.submit(describe_sobject, org, sobject): sobject for sobject in sobjects}
+        future_to_sobject = {executor.submit(describe_sobject, org, sobject, cache): sobject for sobject in sobjects}
         
         results = []
         for future in concurrent.futures.as_completed(future_to_sobject):
@@ -770,7 +1420,9 @@ def process_automation_batched(org: str, object_names: List[str], cache: Optiona
         for object_name in object_names:
             cached_data = get_cached_automation_data(cache, object_name)
             if cached_data:
-                cached_results[object_name] = cached_data.get('data', {})
+                # Negative entries mean the object had no automation last time; leave it out as a fresh fetch would
+                if not cached_data.get('metadata', {}).get('negative'):
+                    cached_results[object_name] = cached_data.get('data', {})
             else:
                 uncached_objects.append(object_name)
     else:
@@ -784,6 +1436,13 @@ def process_automation_batched(org: str, object_names: List[str], cache: Optiona
         if cache:
             for object_name, data in batched_results.items():
                 cache_automation_data(cache, object_name, data)
+            
+            # Objects without automation are absent from the results; cache that too so they are
+            # not re-queried every run. An entirely empty result may be a failed fetch, so skip it.
+            if batched_results:
+                for object_name in uncached_objects:
+                    if object_name not in batched_results:
+                        cache.cache_negative(object_name, 'automation')
         
         # Combine cached and fresh results
         cached_results.update(batched_results)
@@ -794,11 +1453,8 @@ def process_security_batched(org: str, object_names: List[str], cache: Optional[
     """Process security data (field-level and object-level permissions) using batched API calls."""
     logger.info(f"Processing security data for {len(object_names)} objects using batched API calls")
     
-    # Get field-level security
-    fls_data = get_all_field_level_security_batched(org, object_names)
-    
-    # Get object-level permissions
-    object_permissions_data = get_all_object_permissions_batched(org, object_names)
+    # Get field-level security and object-level permissions concurrently
+    fls_data, object_permissions_data = get_security_data_batched(org, object_names)
     
     # Get profiles and permission sets
     profiles_and_permission_sets = get_all_profiles_and_permission_sets_batched(org)
@@ -835,13 +1491,45 @@ def process_stats_batched(org: str, object_names: List[str], sample_n: int = 100
         uncached_objects = object_names
     
     # Fetch data for uncached objects using batched API calls
+    if uncached_objects:
+        checksums = {}
+        if cache:
+            # Expired entries whose records have not changed since they were cached are still valid;
+            # only entries written with a checksum can be revalidated
+            stale_entries = {
+                object_name: stale for object_name in uncached_objects
+                if (stale := cache.get_stale_data(object_name, 'stats', sample_n=sample_n))
+            }
+            revalidatable = [object_name for object_name, stale in stale_entries.items() if stale['metadata'].get('modstamp_max')]
+            if revalidatable:
+                checksums = get_latest_modstamps(org, revalidatable)
+            still_uncached = []
+            for object_name in uncached_objects:
+                modstamp_max, record_count = checksums.get(object_name, (None, None))
+                revalidated = cache.validate_by_modstamp(object_name, 'stats', modstamp_max, record_count=record_count, sample_n=sample_n)
+                if revalidated:
+                    cached_results[object_name] = revalidated.get('data', {})
+                else:
+                    still_uncached.append(object_name)
+            if len(still_uncached) < len(uncached_objects):
+                logger.info(f"Revalidated {len(uncached_objects) - len(still_uncached)} cached stats entries by SystemModstamp")
+            uncached_objects = still_uncached
+            
+            # Checksum stale objects about to be refetched before fetching, so the stored checksum never
+            # postdates the data; objects with no entry at all (a cold cache) are not worth the extra query
+            unchecked = [object_name for object_name in uncached_objects if object_name in stale_entries and object_name not in checksums]
+            if unchecked:
+                checksums.update(get_latest_modstamps(org, unchecked))
+    
     if uncached_objects:
         batched_results = get_all_stats_data_batched(org, uncached_objects, sample_n)
         
         # Cache the results
         if cache:
             for object_name, data in batched_results.items():
-                cache_stats_data(cache, object_name, data, sample_n)
+                # Failed fetches get no checksum, so they expire after the TTL instead of being revalidated forever
+                checksum = None if data.get('error') else checksums.get(object_name)
+                cache_stats_data(cache, object_name, data, sample_n, checksum=checksum)
         
         # Combine cached and fresh results
         cached_results.update(batched_results)
@@ -853,8 +1541,8 @@ def check_existing_schema_data(output_dir: Path) -> Optional[Dict[str, Any]]:
     schema_file = output_dir / "schema.json"
     if schema_file.exists():
         try:
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(schema_file, 'rb') as f:
+                data = _json_loads(f.read())
                 logger.info(f"Found existing schema data with {len(data.get('objects', {}))} objects")
                 return data
         except Exception as e:
@@ -866,8 +1554,8 @@ def check_existing_stats_data(output_dir: Path) -> Optional[Dict[str, Any]]:
     stats_file = output_dir / "stats.json"
     if stats_file.exists():
         try:
-            with open(stats_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(stats_file, 'rb') as f:
+                data = _json_loads(f.read())
                 logger.info(f"Found existing stats data for {len(data)} objects")
                 return data
         except Exception as e:
@@ -879,8 +1567,8 @@ def check_existing_automation_data(output_dir: Path) -> Optional[Dict[str, Any]]
     automation_file = output_dir / "automation.json"
     if automation_file.exists():
         try:
-            with open(automation_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(automation_file, 'rb') as f:
+                data = _json_loads(f.read())
                 logger.info(f"Found existing automation data for {len(data)} objects")
                 return data
         except Exception as e:
@@ -892,8 +1580,8 @@ def check_existing_security_data(output_dir: Path) -> Optional[Dict[str, Any]]:
     security_file = output_dir / "security.json"
     if security_file.exists():
         try:
-            with open(security_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(security_file, 'rb') as f:
+                data = _json_loads(f.read())
                 logger.info(f"Found existing security data for {len(data)} objects")
                 return data
         except Exception as e:
@@ -909,8 +1597,8 @@ def check_partial_security_data(output_dir: Path) -> Tuple[Dict[str, Any], List[
     # Check for existing security data
     if security_file.exists():
         try:
-            with open(security_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(security_file, 'rb') as f:
+                data = _json_loads(f.read())
                 completed_objects = data
                 logger.info(f"Found existing security data for {len(data)} objects")
         except Exception as e:
@@ -920,13 +1608,14 @@ def check_partial_security_data(output_dir: Path) -> Tuple[Dict[str, Any], List[
     progress_file = output_dir / "security_progress.json"
     if progress_file.exists():
         try:
-            with open(progress_file, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
+            with open(progress_file, 'rb') as f:
+                progress_data = _json_loads(f.read())
                 all_objects = progress_data.get('all_objects', [])
                 processed_objects = progress_data.get('processed_objects', [])
                 
                 # Calculate remaining objects
-                remaining_objects = [obj for obj in all_objects if obj not in processed_objects]
+                processed_set = set(processed_objects)
+                remaining_objects = [obj for obj in all_objects if obj not in processed_set]
                 logger.info(f"Found progress tracking: {len(processed_objects)} processed, {len(remaining_objects)} remaining")
         except Exception as e:
             logger.warning(f"Failed to load progress tracking: {e}")
@@ -981,11 +1670,8 @@ def process_security_batched_with_resume(org: str, object_names: List[str], cach
     
     # Process remaining objects
     try:
-        # Get field-level security for remaining objects
-        fls_data = get_all_field_level_security_batched(org, remaining_objects)
-        
-        # Get object-level permissions for remaining objects
-        object_permissions_data = get_all_object_permissions_batched(org, remaining_objects)
+        # Get field-level security and object-level permissions for remaining objects
+        fls_data, object_permissions_data = get_security_data_batched(org, remaining_objects)
         
         # Get profiles and permission sets (only once, not per object)
         profiles_and_permission_sets = get_all_profiles_and_permission_sets_batched(org)
@@ -1031,7 +1717,7 @@ def get_sobject_names_from_schema(schema_data: Dict[str, Any]) -> List[str]:
         return list(objects.keys())
     elif isinstance(objects, list):
         # Old format: {"objects": [{"name": "Account", ...}, {"name": "Contact", ...}]}
-        return [obj.get('name', '') for obj in objects if obj.get('name')]
+        return [name for obj in objects if (name := obj.get('name'))]
     else:
         logger.warning(f"Unexpected objects format: {type(objects)}")
         return []
@@ -1051,13 +1737,15 @@ def emit_markdown_files(output_dir: Path, schema_data: Dict[str, Any], automatio
         object_items = objects.items()
     elif isinstance(objects, list):
         # Old format: {"objects": [{"name": "Account", ...}, {"name": "Contact", ...}]}
-        object_items = [(obj.get('name', ''), obj) for obj in objects if obj.get('name')]
+        object_items = [(name, obj) for obj in objects if (name := obj.get('name'))]
     else:
         logger.warning(f"Unexpected objects format: {type(objects)}")
         return
     
+    # Plain string joins avoid building a Path object per emitted file
+    md_dir_str = os.fspath(md_dir)
     for object_name, object_data in object_items:
-        md_file = md_dir / f"{object_name}.md"
+        md_file = os.path.join(md_dir_str, f"{object_name}.md")
         
         # Build markdown content
         content = f"# {object_name}\n\n"
@@ -1129,7 +1817,7 @@ def emit_jsonl_files(output_dir: Path, schema_data: Dict[str, Any], automation_d
         object_items = objects.items()
     elif isinstance(objects, list):
         # Old format: {"objects": [{"name": "Account", ...}, {"name": "Contact", ...}]}
-        object_items = [(obj.get('name', ''), obj) for obj in objects if obj.get('name')]
+        object_items = [(name, obj) for obj in objects if (name := obj.get('name'))]
     else:
         logger.warning(f"Unexpected objects format: {type(objects)}")
         return
@@ -1251,7 +1939,7 @@ def emit_jsonl_files(output_dir: Path, schema_data: Dict[str, Any], automation_d
                 }
             }
             
-            f.write(json.dumps(entry) + "\n")
+            f.write(_json_dumps(entry) + "\n")
     
     # Add separate security documents for better retrieval
     if security_data:
@@ -1303,30 +1991,43 @@ def emit_jsonl_files(output_dir: Path, schema_data: Dict[str, Any], automation_d
                         
                         # Add comprehensive field permission information for better searchability
                         if len(field_perms) > 0:
-                            # Group by profile for better organization
+                            # Group by profile, tally read/edit flags and bucket sample fields in a single pass
+                            # profile -> [field_count, read_count, edit_count]
                             profiles_with_perms = {}
+                            total_readable = 0
+                            total_editable = 0
+                            sample_fields = ('Account.Name', 'Account.Type', 'Account.Industry', 'Account.BillingAddress', 'Account.Phone')
+                            sample_field_perms = {sample_field: [] for sample_field in sample_fields}
                             for field_perm in field_perms:
                                 if isinstance(field_perm, dict):
+                                    field_name = field_perm.get('field') or ''
+                                    if field_name.startswith(sample_fields):
+                                        for sample_field in sample_fields:
+                                            if field_name.startswith(sample_field):
+                                                sample_field_perms[sample_field].append(field_perm)
                                     profile = field_perm.get('profile', 'Unknown')
-                                    if profile not in profiles_with_perms:
-                                        profiles_with_perms[profile] = []
-                                    profiles_with_perms[profile].append(field_perm)
+                                    counts = profiles_with_perms.get(profile)
+                                    if counts is None:
+                                        counts = profiles_with_perms[profile] = [0, 0, 0]
+                                    counts[0] += 1
+                                    if field_perm.get('read', False):
+                                        counts[1] += 1
+                                        total_readable += 1
+                                    if field_perm.get('edit', False):
+                                        counts[2] += 1
+                                        total_editable += 1
                             
                             # Add profile summary
                             security_content += f"Field permissions across {len(profiles_with_perms)} profiles:\n"
-                            for profile, perms in list(profiles_with_perms.items())[:10]:  # Show first 10 profiles
-                                read_count = sum(1 for p in perms if p.get('read', False))
-                                edit_count = sum(1 for p in perms if p.get('edit', False))
-                                security_content += f"  - {profile}: {len(perms)} fields (Read: {read_count}, Edit: {edit_count})\n"
+                            for profile, (field_count, read_count, edit_count) in itertools.islice(profiles_with_perms.items(), 10):  # Show first 10 profiles
+                                security_content += f"  - {profile}: {field_count} fields (Read: {read_count}, Edit: {edit_count})\n"
                             
                             if len(profiles_with_perms) > 10:
                                 security_content += f"  ... and {len(profiles_with_perms) - 10} more profiles\n"
                             
                             # Add sample field details for key fields
                             security_content += "\nSample field permissions:\n"
-                            sample_fields = ['Account.Name', 'Account.Type', 'Account.Industry', 'Account.BillingAddress', 'Account.Phone']
-                            for sample_field in sample_fields:
-                                field_perms_for_sample = [p for p in field_perms if p.get('field', '').startswith(sample_field)]
+                            for field_perms_for_sample in sample_field_perms.values():
                                 if field_perms_for_sample:
                                     for field_perm in field_perms_for_sample[:3]:  # Show up to 3 profiles per field
                                         field_name = field_perm.get('field', 'Unknown')
@@ -1335,9 +2036,7 @@ def emit_jsonl_files(output_dir: Path, schema_data: Dict[str, Any], automation_d
                                         edit = field_perm.get('edit', False)
                                         security_content += f"  - {field_name}: Profile={profile}, Read={read}, Edit={edit}\n"
                             
-                            # Add general field permission statistics
-                            total_readable = sum(1 for p in field_perms if p.get('read', False))
-                            total_editable = sum(1 for p in field_perms if p.get('edit', False))
+                            # Add general field permission statistics (tallied above)
                             security_content += f"\nField permission summary: {total_readable} readable fields, {total_editable} editable fields\n"
                             
                     elif isinstance(sec_data['field_permissions'], dict):
@@ -1354,7 +2053,7 @@ def emit_jsonl_files(output_dir: Path, schema_data: Dict[str, Any], automation_d
                     }
                 }
                 
-                f_append.write(json.dumps(security_entry) + "\n")
+                f_append.write(_json_dumps(security_entry) + "\n")
     
     logger.info(f"Emitted JSONL file: {jsonl_file}")
 
@@ -1429,7 +2128,7 @@ def push_to_pinecone(output_dir: Path, schema_data: Dict[str, Any], automation_d
             object_items = objects.items()
         elif isinstance(objects, list):
             # Old format: {"objects": [{"name": "Account", ...}, {"name": "Contact", ...}]}
-            object_items = [(obj.get('name', ''), obj) for obj in objects if obj.get('name')]
+            object_items = [(name, obj) for obj in objects if (name := obj.get('name'))]
         else:
             logger.warning(f"Unexpected objects format: {type(objects)}")
             return
@@ -1543,14 +2242,15 @@ def push_to_pinecone(output_dir: Path, schema_data: Dict[str, Any], automation_d
             logger.info("Uploading ALL documents from corpus.jsonl...")
             doc_count = 0
             
-            with open(corpus_file, 'r', encoding='utf-8') as f:
+            # orjson decodes the raw bytes itself, so skip the text-mode decode
+            with open(corpus_file, 'rb') as f:
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
                     
                     try:
-                        doc = json.loads(line)
+                        doc = _json_loads(line)
                         
                         # Process ALL documents (not just security documents)
                         # Generate embedding for document
@@ -1611,8 +2311,8 @@ def get_profiles_metadata_via_cli(org: str) -> List[dict]:
             logger.warning(f"Could not set default org: {e}")
         
         # List all profiles
-        result = run_sf(["org", "list", "metadata", "--metadata-type", "Profile", "--json"], "")
-        profiles_list = json.loads(result)
+        result = run_sf_cached(("org", "list", "metadata", "--metadata-type", "Profile", "--json"), "")
+        profiles_list = _json_loads(result)
         
         profiles_metadata = []
         total_profiles = len(profiles_list.get('result', []))
@@ -1638,7 +2338,7 @@ def get_profiles_metadata_via_cli(org: str) -> List[dict]:
                 try:
                     profile_details_query = f"SELECT Id, Name, UserType, Description FROM Profile WHERE Name = '{profile_name}'"
                     profile_details_result = run_sf(["data", "query", "--query", profile_details_query, "--json"], "")
-                    profile_details = json.loads(profile_details_result)
+                    profile_details = _json_loads(profile_details_result)
                     
                     if profile_details.get('result', {}).get('records'):
                         profile_data = profile_details['result']['records'][0]
@@ -1661,7 +2361,7 @@ def get_profiles_metadata_via_cli(org: str) -> List[dict]:
                     LIMIT 100
                     """
                     object_perms_result = run_sf(["data", "query", "--query", object_perms_query, "--json"], "")
-                    object_perms_data = json.loads(object_perms_result)
+                    object_perms_data = _json_loads(object_perms_result)
                     
                     if object_perms_data.get('result', {}).get('records'):
                         profile_metadata['object_permissions'] = object_perms_data['result']['records']
@@ -1699,8 +2399,8 @@ def get_permission_sets_metadata_via_cli(org: str) -> List[dict]:
             logger.warning(f"Could not set default org: {e}")
         
         # List all permission sets
-        result = run_sf(["org", "list", "metadata", "--metadata-type", "PermissionSet", "--json"], "")
-        permission_sets_list = json.loads(result)
+        result = run_sf_cached(("org", "list", "metadata", "--metadata-type", "PermissionSet", "--json"), "")
+        permission_sets_list = _json_loads(result)
         
         permission_sets_metadata = []
         total_permission_sets = len(permission_sets_list.get('result', []))
@@ -1726,7 +2426,7 @@ def get_permission_sets_metadata_via_cli(org: str) -> List[dict]:
                 try:
                     ps_details_query = f"SELECT Id, Name, Label, Description FROM PermissionSet WHERE Name = '{ps_name}'"
                     ps_details_result = run_sf(["data", "query", "--query", ps_details_query, "--json"], "")
-                    ps_details = json.loads(ps_details_result)
+                    ps_details = _json_loads(ps_details_result)
                     
                     if ps_details.get('result', {}).get('records'):
                         ps_data = ps_details['result']['records'][0]
@@ -1749,7 +2449,7 @@ def get_permission_sets_metadata_via_cli(org: str) -> List[dict]:
                     LIMIT 100
                     """
                     object_perms_result = run_sf(["data", "query", "--query", object_perms_query, "--json"], "")
-                    object_perms_data = json.loads(object_perms_result)
+                    object_perms_data = _json_loads(object_perms_result)
                     
                     if object_perms_data.get('result', {}).get('records'):
                         ps_metadata['object_permissions'] = object_perms_data['result']['records']
@@ -1789,12 +2489,12 @@ def get_detailed_field_permissions_via_cli(org: str, object_names: List[str]) ->
             logger.warning(f"Could not set default org: {e}")
         
         # Get all profiles first
-        profiles_result = run_sf(["org", "list", "metadata", "--metadata-type", "Profile", "--json"], "")
-        profiles_list = json.loads(profiles_result)
+        profiles_result = run_sf_cached(("org", "list", "metadata", "--metadata-type", "Profile", "--json"), "")
+        profiles_list = _json_loads(profiles_result)
         
         # Get all permission sets
-        permission_sets_result = run_sf(["org", "list", "metadata", "--metadata-type", "PermissionSet", "--json"], "")
-        permission_sets_list = json.loads(permission_sets_result)
+        permission_sets_result = run_sf_cached(("org", "list", "metadata", "--metadata-type", "PermissionSet", "--json"), "")
+        permission_sets_list = _json_loads(permission_sets_result)
         
         logger.info(f"Found {len(profiles_list.get('result', []))} profiles and {len(permission_sets_list.get('result', []))} permission sets")
         
@@ -1807,7 +2507,7 @@ def get_detailed_field_permissions_via_cli(org: str, object_names: List[str]) ->
                 # Get fields for this object
                 fields_query = f"SELECT QualifiedApiName, Label, DataType FROM FieldDefinition WHERE EntityDefinition.QualifiedApiName = '{object_name}' AND DataType NOT IN ('base64', 'location')"
                 fields_result = run_sf(["data", "query", "--query", fields_query, "--json"], "")
-                fields = json.loads(fields_result)["result"]["records"]
+                fields = _json_loads(fields_result)["result"]["records"]
                 
                 logger.info(f"Found {len(fields)} fields for {object_name}")
                 
@@ -1815,7 +2515,7 @@ def get_detailed_field_permissions_via_cli(org: str, object_names: List[str]) ->
                 
                 # Skip field permissions for objects with very few fields (likely system objects)
                 if len(fields) <= 5:
-                    logger.debug(f"Skipping field permissions for {object_name} (only {len(fields)} fields)")
+                    logger.debug("Skipping field permissions for %s (only %d fields)", object_name, len(fields))
                     return object_name, {"field_permissions": []}
                 
                 # Process fields in larger batches for better performance
@@ -1831,7 +2531,7 @@ def get_detailed_field_permissions_via_cli(org: str, object_names: List[str]) ->
                             # Simplified query without PermissionSet relationship
                             field_perms_query = f"SELECT Field, Parent.Profile.Name, PermissionsRead, PermissionsEdit FROM FieldPermissions WHERE Field = '{field_name}' LIMIT 50"
                             field_perms_result = run_sf(["data", "query", "--query", field_perms_query, "--json"], "")
-                            field_perms = json.loads(field_perms_result)["result"]["records"]
+                            field_perms = _json_loads(field_perms_result)["result"]["records"]
                             
                             for perm in field_perms:
                                 field_permissions.append({
@@ -1878,7 +2578,9 @@ def get_detailed_field_permissions_via_cli(org: str, object_names: List[str]) ->
                     logger.error(f"Error processing {obj_name}: {e}")
                     field_permissions_data[obj_name] = {"field_permissions": []}
         
-        total_field_perms = sum(len(obj_data["field_permissions"]) for obj_data in field_permissions_data.values())
+        total_field_perms = 0
+        for obj_data in field_permissions_data.values():
+            total_field_perms += len(obj_data.get("field_permissions", ()))
         logger.info(f"Successfully retrieved {total_field_perms} field permissions across {len(field_permissions_data)} objects")
         return field_permissions_data
         
@@ -1973,7 +2675,7 @@ def main():
         # Step 2: Process objects in parallel (only if not resuming or no existing data)
         if not args.resume or not schema_data:
             logger.info(f"Processing {len(sobjects)} objects in parallel...")
-            objects_data = process_objects_parallel(org_alias, sobjects, args.max_workers)
+            objects_data = process_objects_parallel(org_alias, sobjects, args.max_workers, cache=cache)
             
             # Save schema
             schema_data = {"objects": objects_data}
@@ -2059,15 +2761,23 @@ def main():
                     json.dump(stats_data, f, indent=2)
                 logger.info(f"Stats data saved to {stats_file}")
         
-        # Step 6: Emit markdown files (if requested)
+        # Step 6 & 7: Emit markdown and JSONL files (if requested); both emitters
+        # only read the collected data, so they run side by side
+        emitters = []
         if args.emit_markdown:
             logger.info("Emitting markdown files...")
-            emit_markdown_files(output_dir, schema_data, automation_data, security_data, stats_data)
-        
-        # Step 7: Emit JSONL files (if requested)
+            emitters.append(emit_markdown_files)
         if args.emit_jsonl:
             logger.info("Emitting JSONL files...")
-            emit_jsonl_files(output_dir, schema_data, automation_data, security_data, stats_data)
+            emitters.append(emit_jsonl_files)
+        if emitters:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(emitters)) as executor:
+                futures = [
+                    executor.submit(emit, output_dir, schema_data, automation_data, security_data, stats_data)
+                    for emit in emitters
+                ]
+                for future in futures:
+                    future.result()
         
         # Step 8: Push to Pinecone (if requested)
         if args.push_to_pinecone:
@@ -12,6 +12,9 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# System fields left out of per-field documents
+SYSTEM_FIELDS = frozenset({'Id', 'CreatedDate', 'LastModifiedDate', 'SystemModstamp'})
+
 class DocumentCategory(Enum):
     """Document categories for better organization"""
     OBJECT_SCHEMA = "object_schema"
@@ -181,7 +184,7 @@ class EnhancedDocumentOrganizer:
         
         for field_name, field_data in object_data['fields'].items():
             # Skip system fields for now (can be configured)
-            if field_name in ['Id', 'CreatedDate', 'LastModifiedDate', 'SystemModstamp']:
+            if field_name in SYSTEM_FIELDS:
                 continue
             
             # Build field-specific content
@@ -3,40 +3,107 @@
 Smart caching system for Salesforce schema pipeline.
 
 This module provides intelligent caching for API calls, with automatic
-invalidation, compression, and performance monitoring.
+invalidation, compression, and performance monitoring. Entries live in a
+single SQLite database inside the cache directory.
 """
 
 import json
 import gzip
 import hashlib
+import sqlite3
+import threading
 import time
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta
-import pickle
-import shutil
+from datetime import datetime
+
+# Optional fast serialization and compression
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize cache payloads to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes written by _dumps."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+# Entries are stored as msgpack when available (smaller and faster to decode), JSON otherwise
+SERIALIZATION = 'msgpack' if MSGPACK_AVAILABLE else 'json'
+
+def _serialize(obj: Any) -> bytes:
+    """Serialize a value in the cache's storage format."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(obj, use_bin_type=True)
+    return _dumps(obj)
+
+def _serialize_entry(data_bytes: bytes, metadata: Dict[str, Any]) -> bytes:
+    """Build a serialized {'data': ..., 'metadata': ...} entry around already-serialized data."""
+    if MSGPACK_AVAILABLE:
+        # 0x82 is the msgpack header for a two-entry map
+        return b'\x82' + msgpack.packb('data') + data_bytes + msgpack.packb('metadata') + _serialize(metadata)
+    return b'{"data":' + data_bytes + b',"metadata":' + _dumps(metadata) + b'}'
+
+def _deserialize(serialization: str, raw: bytes) -> Any:
+    """Parse bytes written by _serialize/_serialize_entry in the given format."""
+    if serialization == 'msgpack':
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return _loads(raw)
+
 class SmartCache:
     """
     Intelligent caching system with automatic invalidation and compression.
     
     Features:
     - Automatic cache invalidation based on age
+    - Revalidation of expired entries against the object's latest SystemModstamp
+    - Negative caching of "nothing found" results with a shorter TTL
     - Compression for large data
+    - Single-file SQLite backing store (no per-entry files)
+    - In-memory LRU of decompressed entries in front of the disk cache
     - Cache hit/miss statistics
     - Selective cache clearing
     - Performance monitoring
     """
     
-    def __init__(self, cache_dir: Path, max_age_hours: int = 24, enable_compression: bool = True):
+    def __init__(self, cache_dir: Path, max_age_hours: int = 24, enable_compression: bool = True,
+                 max_memory_entries: int = 1024, negative_ttl_hours: float = 6):
         self.cache_dir = Path(cache_dir)
         self.max_age_seconds = max_age_hours * 3600
+        # Negative entries never outlive regular ones
+        self.negative_max_age_seconds = min(negative_ttl_hours * 3600, self.max_age_seconds)
         self.enable_compression = enable_compression
+        self.max_memory_entries = max_memory_entries
+        # (cache_key, data_type) -> (stored_at, negative, serialization, serialized entry), least recently
+        # used first. Entries are kept serialized so every hit parses a private copy that callers may mutate.
+        self._mem: "OrderedDict[Tuple[str, str], Tuple[float, bool, str, bytes]]" = OrderedDict()
+        self._mem_lock = threading.Lock()
         self.stats = {
             'hits': 0,
+            'memory_hits': 0,
+            'negative_hits': 0,
             'misses': 0,
             'writes': 0,
             'compressed_writes': 0,
@@ -45,9 +112,27 @@ class SmartCache:
         
         # Create cache directory structure
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        (self.cache_dir / 'compressed').mkdir(exist_ok=True)
         (self.cache_dir / 'stats').mkdir(exist_ok=True)
         
+        # One SQLite file holds every entry; the lock serializes use of the shared connection
+        self.db_path = self.cache_dir / 'smart_cache.sqlite3'
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                object_name TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                codec TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (cache_key, data_type)
+            )
+        """)
+        self._db.commit()
+        
         logger.info(f"SmartCache initialized at {self.cache_dir}")
         logger.info(f"Max cache age: {max_age_hours} hours")
         logger.info(f"Compression: {'enabled' if enable_compression else 'disabled'}")
@@ -64,23 +149,50 @@ class SmartCache:
         # Use SHA256 for collision resistance
         return hashlib.sha256(key_data.encode()).hexdigest()[:16]
     
-    def _get_cache_path(self, cache_key: str, data_type: str) -> Path:
-        """Get the cache file path."""
-        if self.enable_compression:
-            return self.cache_dir / 'compressed' / f"{cache_key}_{data_type}.json.gz"
-        else:
-            return self.cache_dir / f"{cache_key}_{data_type}.json"
-    
-    def _is_cache_fresh(self, cache_path: Path) -> bool:
-        """Check if cache file is fresh (within max_age_seconds)."""
-        if not cache_path.exists():
-            return False
+    def _encode(self, raw: bytes) -> Tuple[str, bytes]:
+        """(Optionally) compress a serialized payload, returning (codec, blob).
         
-        try:
-            file_age = time.time() - cache_path.stat().st_mtime
-            return file_age < self.max_age_seconds
-        except OSError:
-            return False
+        The codec records both formats as '<serialization>/<compression>'.
+        """
+        if not self.enable_compression:
+            return f'{SERIALIZATION}/none', raw
+        if ZSTD_AVAILABLE:
+            return f'{SERIALIZATION}/zstd', zstandard.ZstdCompressor(level=3).compress(raw)
+        return f'{SERIALIZATION}/gzip', gzip.compress(raw)
+    
+    def _decompress(self, codec: str, blob: bytes) -> Tuple[str, bytes]:
+        """Decompress a stored payload, returning (serialization, serialized entry)."""
+        # Codecs without a serialization prefix predate msgpack support and are JSON
+        serialization, _, compression = codec.rpartition('/')
+        if compression == 'zstd':
+            blob = zstandard.ZstdDecompressor().decompress(blob)
+        elif compression == 'gzip':
+            blob = gzip.decompress(blob)
+        return serialization or 'json', blob
+    
+    def _decode(self, codec: str, blob: bytes) -> Dict[str, Any]:
+        """Decompress and parse a stored payload."""
+        return _deserialize(*self._decompress(codec, blob))
+    
+    def _fetch_entry(self, cache_key: str, data_type: str) -> Optional[Tuple[float, str, bytes]]:
+        """Fetch (stored_at, codec, payload) for an entry regardless of its age."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT stored_at, codec, payload FROM cache_entries WHERE cache_key = ? AND data_type = ?",
+                (cache_key, data_type)
+            ).fetchone()
+    
+    def _entry_max_age(self, negative: bool) -> float:
+        """Maximum age in seconds for a cached entry, shorter for negative results."""
+        return self.negative_max_age_seconds if negative else self.max_age_seconds
+    
+    def _remember(self, mem_key: Tuple[str, str], stored_at: float, negative: bool, serialization: str, raw: bytes):
+        """Keep a serialized entry in the in-memory LRU, evicting the oldest entry when full."""
+        with self._mem_lock:
+            self._mem[mem_key] = (stored_at, negative, serialization, raw)
+            self._mem.move_to_end(mem_key)
+            if len(self._mem) > self.max_memory_entries:
+                self._mem.popitem(last=False)
     
     def get_cached_data(self, object_name: str, data_type: str, **kwargs) -> Optional[Dict[str, Any]]:
         """
@@ -96,22 +208,43 @@ class SmartCache:
         """
         try:
             cache_key = self._get_cache_key(object_name, data_type, **kwargs)
-            cache_path = self._get_cache_path(cache_key, data_type)
+            mem_key = (cache_key, data_type)
             
-            if not self._is_cache_fresh(cache_path):
+            # Serve already-decompressed payloads from memory
+            with self._mem_lock:
+                entry = self._mem.get(mem_key)
+                if entry is not None and time.time() - entry[0] < self._entry_max_age(entry[1]):
+                    self._mem.move_to_end(mem_key)
+                else:
+                    entry = None
+            if entry is not None:
+                data = _deserialize(entry[2], entry[3])
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                if data['metadata'].get('negative'):
+                    self.stats['negative_hits'] += 1
+                logger.debug("Cache HIT (memory): %s_%s", object_name, data_type)
+                return data
+            
+            row = self._fetch_entry(cache_key, data_type)
+            if row is None or time.time() - row[0] >= self.max_age_seconds:
                 self.stats['misses'] += 1
                 return None
             
             # Load cached data
-            if self.enable_compression and cache_path.suffix == '.gz':
-                with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            stored_at, codec, payload = row
+            serialization, raw = self._decompress(codec, payload)
+            data = _deserialize(serialization, raw)
+            negative = bool(data['metadata'].get('negative'))
+            self._remember(mem_key, stored_at, negative, serialization, raw)
+            if time.time() - stored_at >= self._entry_max_age(negative):
+                self.stats['misses'] += 1
+                return None
             
             self.stats['hits'] += 1
-            logger.debug(f"Cache HIT: {object_name}_{data_type}")
+            if data['metadata'].get('negative'):
+                self.stats['negative_hits'] += 1
+            logger.debug("Cache HIT: %s_%s", object_name, data_type)
             return data
             
         except Exception as e:
@@ -119,7 +252,9 @@ class SmartCache:
             logger.warning(f"Cache read error for {object_name}_{data_type}: {e}")
             return None
     
-    def cache_data(self, object_name: str, data_type: str, data: Dict[str, Any], **kwargs):
+    def cache_data(self, object_name: str, data_type: str, data: Dict[str, Any],
+                   modstamp_max: Optional[str] = None, record_count: Optional[int] = None,
+                   last_modified: Optional[str] = None, negative: bool = False, **kwargs):
         """
         Cache data with metadata.
         
@@ -127,57 +262,166 @@ class SmartCache:
             object_name: Name of the Salesforce object
             data_type: Type of data being cached
             data: Data to cache
+            modstamp_max: Latest SystemModstamp of the object's records when the data was fetched
+            record_count: Number of the object's records when the data was fetched
+            last_modified: HTTP date to send as If-Modified-Since when revalidating the entry
+            negative: The source had nothing for this object; the entry expires after negative_ttl_hours
             **kwargs: Additional parameters for cache key generation
         """
         try:
             cache_key = self._get_cache_key(object_name, data_type, **kwargs)
-            cache_path = self._get_cache_path(cache_key, data_type)
             
-            # Add metadata to cached data
-            cached_data = {
-                'data': data,
-                'metadata': {
-                    'cached_at': datetime.now().isoformat(),
-                    'object_name': object_name,
-                    'data_type': data_type,
-                    'cache_key': cache_key,
-                    'parameters': kwargs
-                }
+            # Serialize the data once; the same bytes are hashed and spliced into the stored payload
+            data_bytes = _serialize(data)
+            metadata = {
+                'cached_at': datetime.now().isoformat(),
+                'object_name': object_name,
+                'data_type': data_type,
+                'cache_key': cache_key,
+                'parameters': kwargs,
+                'hash': hashlib.sha256(data_bytes).hexdigest(),
+                'modstamp_max': modstamp_max,
+                'record_count': record_count,
+                'last_modified': last_modified,
+                'negative': negative
             }
             
             # Write to cache
-            if self.enable_compression and cache_path.suffix == '.gz':
-                with gzip.open(cache_path, 'wt', encoding='utf-8') as f:
-                    json.dump(cached_data, f, indent=2)
+            raw = _serialize_entry(data_bytes, metadata)
+            codec, payload = self._encode(raw)
+            stored_at = time.time()
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache_entries (cache_key, data_type, object_name, stored_at, codec, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key, data_type, object_name, stored_at, codec, payload)
+                )
+                self._db.commit()
+            if not codec.endswith('/none'):
                 self.stats['compressed_writes'] += 1
-            else:
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cached_data, f, indent=2)
+            self._remember((cache_key, data_type), stored_at, negative, SERIALIZATION, raw)
             
             self.stats['writes'] += 1
-            logger.debug(f"Cache WRITE: {object_name}_{data_type}")
+            logger.debug("Cache WRITE: %s_%s", object_name, data_type)
             
         except Exception as e:
             self.stats['errors'] += 1
             logger.error(f"Cache write error for {object_name}_{data_type}: {e}")
     
+    def cache_negative(self, object_name: str, data_type: str, data: Optional[Dict[str, Any]] = None, **kwargs):
+        """
+        Cache that the source had nothing for an object, so it is not re-queried on every run.
+        
+        Negative entries are served like regular ones (with metadata['negative'] set) but
+        expire after negative_ttl_hours.
+        
+        Args:
+            data: The empty result to serve on hits (defaults to {})
+        """
+        self.cache_data(object_name, data_type, {} if data is None else data, negative=True, **kwargs)
+    
+    def validate_by_modstamp(self, object_name: str, data_type: str, latest_modstamp: Optional[str],
+                             record_count: Optional[int] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Revalidate a cached entry, even an expired one, against the object's latest SystemModstamp.
+        
+        When the modstamp and record count recorded at write time both match, the entry's
+        age is reset so it is served again instead of being refetched. The count catches
+        deletions, which do not move the latest modstamp.
+        
+        Returns:
+            The cached data dict if it is still current, None otherwise
+        """
+        if not latest_modstamp:
+            return None
+        
+        data = self.get_stale_data(object_name, data_type, **kwargs)
+        if data is None:
+            return None
+        metadata = data.get('metadata', {})
+        if metadata.get('modstamp_max') != latest_modstamp or metadata.get('record_count') != record_count:
+            return None
+        return data if self.mark_fresh(object_name, data_type, data, **kwargs) else None
+    
+    def get_stale_data(self, object_name: str, data_type: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Get cached data regardless of its age, for revalidation against the source.
+        
+        Returns:
+            Cached data dict if an entry exists, None otherwise
+        """
+        try:
+            cache_key = self._get_cache_key(object_name, data_type, **kwargs)
+            with self._mem_lock:
+                entry = self._mem.get((cache_key, data_type))
+            if entry is not None:
+                return _deserialize(entry[2], entry[3])
+            
+            row = self._fetch_entry(cache_key, data_type)
+            return self._decode(row[1], row[2]) if row is not None else None
+            
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Cache read error for {object_name}_{data_type}: {e}")
+            return None
+    
+    def mark_fresh(self, object_name: str, data_type: str, data: Dict[str, Any], **kwargs) -> bool:
+        """
+        Reset the age of an entry that the source confirmed is unchanged.
+        
+        Args:
+            data: The entry's cached data, as returned by get_stale_data
+            
+        Returns:
+            True if the entry was refreshed, False if it no longer exists
+        """
+        try:
+            cache_key = self._get_cache_key(object_name, data_type, **kwargs)
+            stored_at = time.time()
+            with self._lock:
+                updated = self._db.execute(
+                    "UPDATE cache_entries SET stored_at = ? WHERE cache_key = ? AND data_type = ?",
+                    (stored_at, cache_key, data_type)
+                ).rowcount
+                self._db.commit()
+            if not updated:
+                return False
+            
+            mem_key = (cache_key, data_type)
+            with self._mem_lock:
+                entry = self._mem.get(mem_key)
+                if entry is not None:
+                    self._mem[mem_key] = (stored_at, *entry[1:])
+                    self._mem.move_to_end(mem_key)
+            self.stats['hits'] += 1
+            logger.debug("Cache REVALIDATED: %s_%s", object_name, data_type)
+            return True
+            
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Cache revalidation error for {object_name}_{data_type}: {e}")
+            return False
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics."""
         total_requests = self.stats['hits'] + self.stats['misses']
         hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
-        # Calculate cache size
+        # Calculate cache size (database plus its write-ahead log)
+        with self._lock:
+            cache_files = self._db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
         cache_size = 0
-        cache_files = 0
-        for cache_file in self.cache_dir.rglob('*.json*'):
+        for db_file in (self.db_path, self.db_path.with_name(self.db_path.name + '-wal')):
             try:
-                cache_size += cache_file.stat().st_size
-                cache_files += 1
+                cache_size += db_file.stat().st_size
             except OSError:
                 pass
         
         return {
             'hits': self.stats['hits'],
+            'memory_hits': self.stats['memory_hits'],
+            'negative_hits': self.stats['negative_hits'],
+            'memory_entries': len(self._mem),
             'misses': self.stats['misses'],
             'writes': self.stats['writes'],
             'compressed_writes': self.stats['compressed_writes'],
@@ -196,54 +440,60 @@ class SmartCache:
             data_type: If specified, only clear this data type
             older_than_hours: If specified, only clear entries older than this
         """
-        cleared_count = 0
         current_time = time.time()
         
-        for cache_file in self.cache_dir.rglob('*.json*'):
-            try:
-                # Check if we should clear this file
-                should_clear = True
-                
-                if data_type and data_type not in cache_file.name:
-                    should_clear = False
-                
-                if older_than_hours:
-                    file_age = current_time - cache_file.stat().st_mtime
-                    if file_age < (older_than_hours * 3600):
-                        should_clear = False
-                
-                if should_clear:
-                    cache_file.unlink()
-                    cleared_count += 1
-                    
-            except OSError as e:
-                logger.warning(f"Error clearing cache file {cache_file}: {e}")
+        conditions = []
+        params: List[Any] = []
+        if data_type:
+            conditions.append("instr(data_type, ?) > 0")
+            params.append(data_type)
+        if older_than_hours:
+            conditions.append("stored_at <= ?")
+            params.append(current_time - older_than_hours * 3600)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        logger.info(f"Cleared {cleared_count} cache files")
+        try:
+            with self._lock:
+                cleared_count = self._db.execute(f"DELETE FROM cache_entries{where}", params).rowcount
+                self._db.commit()
+        except sqlite3.Error as e:
+            cleared_count = 0
+            logger.warning(f"Error clearing cache entries: {e}")
+        
+        with self._mem_lock:
+            for mem_key, (stored_at, *_) in list(self._mem.items()):
+                if data_type and data_type not in mem_key[1]:
+                    continue
+                if older_than_hours and current_time - stored_at < (older_than_hours * 3600):
+                    continue
+                del self._mem[mem_key]
+        
+        logger.info(f"Cleared {cleared_count} cache entries")
         return cleared_count
     
     def get_cache_info(self) -> Dict[str, Any]:
         """Get detailed cache information."""
-        cache_files = []
-        total_size = 0
-        
-        for cache_file in self.cache_dir.rglob('*.json*'):
-            try:
-                stat = cache_file.stat()
-                cache_files.append({
-                    'name': cache_file.name,
-                    'size_bytes': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'age_hours': (time.time() - stat.st_mtime) / 3600
-                })
-                total_size += stat.st_size
-            except OSError:
-                pass
+        current_time = time.time()
+        with self._lock:
+            total_files, total_size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length(payload)), 0) FROM cache_entries"
+            ).fetchone()
+            oldest = self._db.execute(
+                "SELECT cache_key, data_type, length(payload), stored_at FROM cache_entries ORDER BY stored_at LIMIT 10"
+            ).fetchall()
         
         return {
-            'total_files': len(cache_files),
+            'total_files': total_files,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'files': sorted(cache_files, key=lambda x: x['age_hours'], reverse=True)[:10]  # Top 10 oldest
+            'files': [  # Top 10 oldest
+                {
+                    'name': f"{cache_key}_{data_type}",
+                    'size_bytes': size_bytes,
+                    'modified': datetime.fromtimestamp(stored_at).isoformat(),
+                    'age_hours': (current_time - stored_at) / 3600
+                }
+                for cache_key, data_type, size_bytes, stored_at in oldest
+            ]
         }
     
     def save_stats(self):
@@ -258,6 +508,11 @@ class SmartCache:
         with open(stats_file, 'w') as f:
             json.dump(stats_data, f, indent=2)
     
+    def close(self):
+        """Close the backing database connection."""
+        with self._lock:
+            self._db.close()
+    
     def __str__(self) -> str:
         stats = self.get_cache_stats()
         return f"SmartCache(hits={stats['hits']}, misses={stats['misses']}, hit_rate={stats['hit_rate_percent']}%)"